@@ -0,0 +1,41 @@
+"""Compare games per second for the batch simulator and the match engine.
+
+Requires NumPy. Run from the repository root:
+
+    python benchmarks/batch_bench.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from tictactoe import batch, engine, players  # noqa: E402
+
+
+def games_per_second(play, n_games):
+    start = time.perf_counter()
+    play(n_games)
+    return n_games / (time.perf_counter() - start)
+
+
+def main(n_engine_games=20000, n_batch_games=1000000):
+    print(f"{'':18}{'engine':>12}{'batch':>12}{'speedup':>10}")
+    for name1, name2 in [("Easy", "Easy"), ("Medium", "Easy"), ("Medium", "Medium")]:
+        player1 = players.difficulties[name1](seed=1)
+        player2 = players.difficulties[name2](seed=2)
+        policy1, policy2 = batch.policies[name1], batch.policies[name2]
+
+        engine_rate = games_per_second(
+            lambda n: list(engine.play_many(player1, player2, n)), n_engine_games
+        )
+        batch_rate = games_per_second(
+            lambda n: batch.simulate(n, policy1, policy2, seed=1), n_batch_games
+        )
+        label = f"{name1} v {name2}"
+        speedup = batch_rate / engine_rate
+        print(f"{label:18}{engine_rate:12.0f}{batch_rate:12.0f}{speedup:9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""Time importing parts of the package in a fresh interpreter.
+
+Run from the repository root:
+
+    python benchmarks/import_bench.py
+
+Each statement runs in a new python process, and the fastest of several
+runs is reported after subtracting the time to start python itself.
+"""
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+STATEMENTS = [
+    "import tictactoe",
+    "import tictactoe.board",
+    "import tictactoe.players",
+    "import tictactoe.engine",
+    "import tictactoe; tictactoe.Game",
+]
+
+
+def time_statement(statement, repeat=20):
+    """Return the fastest wall time of running a statement in a new process."""
+    env = dict(os.environ, PYTHONPATH=ROOT, PYTHONDONTWRITEBYTECODE="")
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", statement], env=env, check=True)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    baseline = time_statement("pass")
+    print(f"{'python -c pass':<40}{baseline * 1000:>8.1f} ms")
+    for statement in STATEMENTS:
+        elapsed = time_statement(statement) - baseline
+        print(f"{statement:<40}{elapsed * 1000:>+8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
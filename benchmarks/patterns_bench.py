@@ -0,0 +1,74 @@
+"""Compare the pattern lookup tables with linear scans over the patterns.
+
+Run from the repository root:
+
+    python benchmarks/patterns_bench.py
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from tictactoe import patterns, players  # noqa: E402
+from tictactoe.board import Board  # noqa: E402
+
+
+def loop_is_over(board):
+    return any(
+        board[s1] == board[s2] == board[s3] for s1, s2, s3 in patterns.winning_patterns
+    )
+
+
+def loop_find_winning_pattern(board):
+    for s1, s2, s3 in patterns.winning_patterns:
+        if board[s1] == board[s2] == board[s3]:
+            return s1, s2, s3
+    return -1, -1, -1
+
+
+def loop_find_winning_move(board, token):
+    for (s1, s2), s3 in patterns.partial_patterns.items():
+        if board[s1] == board[s2] == token and board[s3] not in board.tokens:
+            return s3
+    return -1
+
+
+def make_board():
+    """A mid-game board without a winner, so every scan runs to the end."""
+    board = Board(tokens=["X", "O"])
+    for space, token in [(0, "X"), (4, "O"), (8, "X"), (2, "O")]:
+        board[space] = token
+    return board
+
+
+def main(number=100000):
+    board = make_board()
+    computer = players.Computer()
+    computer.token = "X"
+
+    cases = [
+        ("is_over", lambda: loop_is_over(board), board.is_over),
+        (
+            "find_winning_pattern",
+            lambda: loop_find_winning_pattern(board),
+            board.find_winning_pattern,
+        ),
+        (
+            "find_winning_move",
+            lambda: loop_find_winning_move(board, "O"),
+            lambda: computer.find_winning_move(board, token="O"),
+        ),
+    ]
+
+    print(f"{'':24}{'loop (us)':>12}{'table (us)':>12}{'speedup':>10}")
+    for name, loop, table in cases:
+        assert loop() == table(), name
+        loop_time = timeit.timeit(loop, number=number) / number * 1e6
+        table_time = timeit.timeit(table, number=number) / number * 1e6
+        speedup = loop_time / table_time
+        print(f"{name:24}{loop_time:12.2f}{table_time:12.2f}{speedup:9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+import io
+
+from tictactoe import analyze, engine, players, records
+
+
+def make_record(moves, difficulties=("Easy", "Hard")):
+    return records.GameRecord(
+        ("X", "O"), ("Computer", "Computer"), difficulties, (None, None), moves
+    )
+
+
+def test_analyzer_finds_blunders():
+    analyzer = analyze.Analyzer()
+    # O answers a corner opening with an edge, which loses
+    analyzer.add_record(make_record([0, 1, 4, 8, 6, 3, 2]))
+    assert analyzer.by_turn[1][analyze.THREW_AWAY] == 1
+    assert analyzer.by_turn[2][analyze.IMPROVED] == 1
+    assert analyzer.by_player["Hard"][analyze.THREW_AWAY] == 1
+    assert analyzer.by_player["Easy"][analyze.THREW_AWAY] == 0
+
+
+def test_perfect_players_never_blunder():
+    player1, player2 = players.SolverComputer(seed=1), players.SolverComputer(seed=2)
+    f = io.BytesIO()
+    writer = records.RecordWriter(f)
+    for _ in engine.play_many(player1, player2, 20, writer=writer):
+        pass
+    f.seek(0)
+
+    analyzer = analyze.Analyzer()
+    analyzer.add_records(records.read_records(f))
+    assert analyzer.n_games == 20
+    assert analyzer.by_player["Perfect"][analyze.THREW_AWAY] == 0
+    assert analyzer.by_player["Perfect"][analyze.KEPT] == 20 * 9
+
+
+def test_report_lists_players_and_turns():
+    analyzer = analyze.Analyzer()
+    analyzer.add_record(make_record([4, 0, 8, 2, 1, 7, 6, 3, 5], (None, "Medium")))
+    report = analyzer.report()
+    assert "Medium" in report
+    assert "Computer" in report  # player type of a player without a difficulty
+    assert "Analyzed 1 games" in report
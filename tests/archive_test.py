@@ -0,0 +1,61 @@
+import random
+
+import pytest
+from tictactoe import archive, engine, players, records
+
+
+@pytest.fixture
+def archive_path(tmpdir):
+    """An archive of Easy v Hard games followed by Hard v Easy games."""
+    path = str(tmpdir.join("games.rec"))
+    easy, hard = players.EasyComputer(seed=1), players.HardComputer(seed=2)
+    with archive.ArchiveWriter(path, block_size=16) as writer:
+        for player1, player2 in [(easy, hard), (hard, easy)]:
+            player1.token, player2.token = "X", "O"
+            for result in engine.play_many(player1, player2, 50):
+                writer.write(player1, player2, result.moves)
+    return path
+
+
+def test_archive_reads_games_by_number(archive_path):
+    with open(archive_path, "rb") as f:
+        streamed = list(records.read_records(f))
+    with archive.Archive(archive_path) as games:
+        assert len(games) == 100
+        assert [games[n] for n in [0, 17, 99]] == [streamed[n] for n in [0, 17, 99]]
+        with pytest.raises(IndexError):
+            games[100]
+
+
+def test_archive_reconstructs_boards(archive_path):
+    with archive.Archive(archive_path) as games:
+        board = games.board(3)
+        assert [move.space for move in board.moves] == games[3].moves
+
+
+def test_archive_summarizes_blocks(archive_path):
+    with archive.Archive(archive_path) as games:
+        blocks = list(games.blocks())
+    assert [block.n_games for block in blocks] == [16] * 6 + [4]
+    assert blocks[0].first_game == 0
+    assert blocks[-1].first_game == 96
+
+
+def test_archive_filters_games(archive_path):
+    with archive.Archive(archive_path) as games:
+        filtered = list(games.filter(winner="X", difficulties=("Hard", "Easy")))
+        assert filtered
+        for n, record in filtered:
+            assert n >= 50
+            assert archive.find_winner(record) == "X"
+            assert record == games[n]
+
+        ties = [n for n, _ in games.filter(winner=archive.TIE)]
+        assert all(len(games[n].moves) == 9 for n in ties)
+        assert not list(games.filter(first_player="O"))
+
+
+def test_archive_samples_games(archive_path):
+    with archive.Archive(archive_path) as games:
+        sample = games.sample(5, random.Random(1))
+        assert len(sample) == 5
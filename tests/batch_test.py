@@ -0,0 +1,43 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from tictactoe import batch, patterns  # noqa: E402
+
+
+def test_find_winners_checks_every_pattern():
+    boards = batch.new_boards(len(patterns.winning_patterns) * 2 + 1)
+    for i, pattern in enumerate(patterns.winning_patterns):
+        boards[2 * i, list(pattern)] = 1
+        boards[2 * i + 1, list(pattern)] = -1
+    winners = batch.find_winners(boards)
+    assert list(winners) == [1, -1] * len(patterns.winning_patterns) + [0]
+
+
+def test_random_policy_picks_open_spaces():
+    rng = np.random.default_rng(1)
+    boards = batch.new_boards(1000)
+    boards[:, :8] = 1  # only space 8 is open
+    assert (batch.random_policy(boards, -1, rng) == 8).all()
+
+
+def test_medium_policy_wins_then_blocks_then_takes_center():
+    rng = np.random.default_rng(1)
+    boards = batch.new_boards(3)
+    boards[0, [0, 1, 3, 6]] = [1, 1, -1, -1]  # first player can win at 2
+    boards[1, [3, 6]] = -1  # first player must block at 0
+    moves = batch.medium_policy(boards, 1, rng)
+    assert list(moves) == [2, 0, 4]
+
+
+def test_simulate_finishes_every_game():
+    result = batch.simulate(1000, batch.medium_policy, batch.random_policy, seed=1)
+    assert (result.lengths >= 5).all()
+    assert ((result.winners != 0) | (result.lengths == 9)).all()
+    assert sum(batch.tally(result.winners)) == 1000
+
+
+def test_simulate_is_repeatable():
+    result1 = batch.simulate(100, batch.random_policy, batch.random_policy, seed=3)
+    result2 = batch.simulate(100, batch.random_policy, batch.random_policy, seed=3)
+    assert (result1.boards == result2.boards).all()
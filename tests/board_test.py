@@ -1,6 +1,6 @@
 import pytest
 from tictactoe import exceptions, patterns
-from tictactoe.board import Board, Move
+from tictactoe.board import Board, MNKBoard, Move
 
 
 def test_board_handles_bad_user_input(xo_board):
@@ -55,3 +55,158 @@ def test_board_detects_tie(xo_board):
     for s in [1, 4, 5, 6]:
         xo_board[s] = "O"
     assert xo_board.is_tie()
+
+
+def test_board_rejects_negative_keys(xo_board):
+    with pytest.raises(exceptions.KeyNotOnBoardError):
+        xo_board[-1]
+
+
+def test_board_rejects_unknown_tokens(xo_board):
+    with pytest.raises(exceptions.ImproperTokenError):
+        xo_board[0] = "Z"
+
+
+def test_board_stores_tokens_as_masks(xo_board):
+    xo_board[0] = "X"
+    xo_board[4] = "O"
+    xo_board[8] = "X"
+    assert xo_board.mask("X") == 0b100000001
+    assert xo_board.mask("O") == 0b000010000
+    assert xo_board.available() == [1, 2, 3, 5, 6, 7]
+    assert xo_board.available_corners() == [2, 6]
+    assert xo_board.available_middles() == [1, 3, 5, 7]
+    assert xo_board.b == ["X", "1", "2", "3", "O", "5", "6", "7", "X"]
+
+
+def test_board_push_and_pop_restore_the_board(xo_board):
+    xo_board[0] = "X"
+    xo_board.push(4, "O")
+    assert xo_board.moves[-1] == Move(4, "O")
+    assert xo_board.pop() == Move(4, "O")
+    assert xo_board.b == ["X"] + [str(s) for s in range(1, 9)]
+    assert xo_board.available() == list(range(1, 9))
+
+
+def test_board_pop_clears_win(xo_board):
+    for space in [0, 1, 2]:
+        xo_board.push(space, "X")
+    assert xo_board.is_over()
+    xo_board.pop()
+    assert not xo_board.is_over()
+
+
+def test_board_records_moves_as_ints(xo_board):
+    xo_board["4"] = "X"
+    assert xo_board.moves == [Move(4, "X")]
+
+
+def test_board_hash_is_restored_by_pop(xo_board):
+    xo_board[4] = "X"
+    start_hash = xo_board.hash
+    xo_board.push(0, "O")
+    assert xo_board.hash != start_hash
+    xo_board.pop()
+    assert xo_board.hash == start_hash
+
+
+def test_board_hash_does_not_depend_on_move_order():
+    board1, board2 = Board(), Board()
+    board1[0], board1[4], board1[8] = "X", "O", "X"
+    board2[8], board2[4], board2[0] = "X", "O", "X"
+    assert board1.hash == board2.hash
+
+
+def test_symmetric_boards_share_canonical_key():
+    keys = set()
+    for corner in patterns.corners:
+        board = Board()
+        board[corner] = "X"
+        board[4] = "O"
+        keys.add(board.canonical_key())
+    assert len(keys) == 1
+
+    board = Board()
+    board[1] = "X"
+    board[4] = "O"
+    assert board.canonical_key() not in keys
+
+
+def test_mnk_board_detects_wins_through_last_move():
+    board = MNKBoard(4, 4, 3)
+    for space in [5, 10]:
+        board[space] = "X"
+    assert not board.is_over()
+    board[15] = "X"
+    assert board.is_over()
+    assert board.find_winning_pattern() == (5, 10, 15)
+
+
+def test_connect_four_sized_board_detects_anti_diagonal():
+    board = MNKBoard(6, 7, 4)
+    # (0, 6), (1, 5), (2, 4), (3, 3)
+    for space in [6, 12, 18]:
+        board[space] = "O"
+    assert not board.is_over()
+    board[24] = "O"
+    assert board.find_winning_pattern() == (6, 12, 18, 24)
+
+
+def test_mnk_board_lines_do_not_wrap_around_rows():
+    board = MNKBoard(4, 4, 3)
+    for space in [2, 3, 4]:
+        board[space] = "X"
+    assert not board.is_over()
+
+
+def test_mnk_board_pop_clears_win():
+    board = MNKBoard(5, 5, 4)
+    for space in [0, 1, 2, 3]:
+        board.push(space, "X")
+    assert board.is_over()
+    board.pop()
+    assert not board.is_over()
+    assert board.find_winning_pattern() == (-1, -1, -1, -1)
+
+
+def test_mnk_board_tracks_open_spaces():
+    board = MNKBoard(3, 4, 3)
+    board[0], board[11] = "X", "O"
+    assert board.available() == list(range(1, 11))
+    assert not board.is_tie()
+    with pytest.raises(exceptions.KeyNotOnBoardError):
+        board[12]
+
+
+def test_mnk_board_finds_completing_spaces():
+    board = MNKBoard(4, 4, 3)
+    board[0], board[1] = "X", "X"
+    board[5] = "O"
+    assert board.completing_spaces("X") == 1 << 2
+    assert board.completing_spaces("O") == 0
+
+
+def test_mnk_board_matches_board_on_3x3():
+    board, mnk = Board(), MNKBoard()
+    for space, token in [(4, "X"), (0, "O"), (8, "X"), (2, "O")]:
+        board[space] = mnk[space] = token
+        assert board.code() == mnk.code()
+        assert board.canonical_key() == mnk.canonical_key()
+        assert board.completing_spaces(token) == mnk.completing_spaces(token)
+
+
+def test_rectangular_boards_share_canonical_key_when_mirrored():
+    board1, board2 = MNKBoard(3, 4, 3), MNKBoard(3, 4, 3)
+    board1[0] = "X"  # top left corner
+    board2[11] = "X"  # bottom right corner
+    assert board1.canonical_key() == board2.canonical_key()
+
+
+def test_board_reset_clears_the_board(xo_board):
+    for space, token in [(0, "X"), (3, "O"), (1, "X"), (4, "O"), (2, "X")]:
+        xo_board[space] = token
+    xo_board.reset()
+    assert not xo_board.is_over()
+    assert xo_board.moves == []
+    assert xo_board.available() == list(range(9))
+    assert xo_board.hash == 0
@@ -1,7 +1,9 @@
 import random
+import itertools
+import time
 import pytest
-from tictactoe import patterns, players
-from tictactoe.board import Board
+from tictactoe import engine, patterns, players
+from tictactoe.board import Board, MNKBoard
 
 
 def test_computer_finds_winning_move(xo_board, x_computer):
@@ -50,6 +52,14 @@ def test_computer_finds_opposite_corner(xo_board, x_computer):
     assert x_computer.find_opposite_corner(xo_board) == 8
 
 
+def test_computer_skips_occupied_corners(xo_board, x_computer):
+    xo_board[0] = "X"
+    xo_board[2] = "O"
+    xo_board[8] = "O"
+    assert x_computer.find_adjacent_corner(xo_board) == 6
+    assert x_computer.find_opposite_corner(xo_board) == -1
+
+
 @pytest.fixture
 def hard_computer():
     hard_computer = players.HardComputer(seed=243)
@@ -91,6 +101,27 @@ def test_hard_computer_chooses_opposite_corner_as_second_move(hard_computer):
     assert hard_computer.move(board) == 8
 
 
+def test_hard_computer_skips_occupied_adjacent_corner(hard_computer):
+    board = Board()
+    board[0] = "X"
+    board[2] = "O"
+    assert hard_computer.move(board) == 6
+
+
+def test_hard_computer_plays_open_space_when_it_has_the_center(hard_computer):
+    board = Board()
+    board[4] = "X"
+    board[0] = "O"
+    assert hard_computer.move(board) in board.available()
+
+
+def test_hard_computer_skips_occupied_center_on_turn_four(hard_computer):
+    board = Board()
+    for space, token in [(4, "X"), (0, "O"), (1, "X"), (7, "O")]:
+        board[space] = token
+    assert hard_computer.move(board) in board.available()
+
+
 def test_hard_computer_wins_if_able(hard_computer):
     for args in patterns.winning_patterns:
         args = list(args)
@@ -127,3 +158,239 @@ def test_hard_computer_response_strategy_picks_mid_spot_turn_three(seed):
 
     move = hard_computer.move(board)
     assert move in patterns.middles
+
+
+@pytest.fixture
+def solver_computer():
+    solver_computer = players.SolverComputer(seed=243)
+    solver_computer.token = "X"
+    return solver_computer
+
+
+def test_solver_computer_wins_if_able(solver_computer):
+    board = Board()
+    for space, token in [(0, "X"), (3, "O"), (1, "X"), (4, "O")]:
+        board[space] = token
+    assert solver_computer.move(board) == 2
+
+
+def test_solver_computer_takes_center_against_corner_opening():
+    solver_computer = players.SolverComputer(seed=1)
+    solver_computer.token = "O"
+    board = Board()
+    board[0] = "X"
+    assert solver_computer.move(board) == 4
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_solver_computer_never_loses(seed):
+    solver_computer = players.SolverComputer(seed=seed)
+    computers = [players.EasyComputer(seed=seed), solver_computer]
+    if seed % 2:
+        computers.reverse()
+    for computer, token in zip(computers, ["X", "O"]):
+        computer.token = token
+
+    board = Board()
+    for computer in itertools.cycle(computers):
+        board[computer.move(board)] = computer.token
+        if board.is_over() or board.is_tie():
+            break
+    if board.is_over():
+        assert board.moves[-1].token == solver_computer.token
+
+
+@pytest.fixture
+def alpha_beta_computer():
+    alpha_beta_computer = players.AlphaBetaComputer(seed=100)
+    alpha_beta_computer.token = "X"
+    return alpha_beta_computer
+
+
+def test_alpha_beta_computer_wins_if_able(alpha_beta_computer):
+    board = MNKBoard(6, 7, 4)
+    for space, token in [(7, "X"), (0, "O"), (8, "X"), (1, "O"), (9, "X"), (2, "O")]:
+        board[space] = token
+    assert alpha_beta_computer.move(board) in [6, 10]
+
+
+def test_alpha_beta_computer_blocks_if_cant_win(alpha_beta_computer):
+    board = MNKBoard(6, 7, 4)
+    for space, token in [(0, "X"), (15, "O"), (41, "X"), (16, "O"), (35, "X")]:
+        board[space] = token
+    board[17] = "O"
+    assert alpha_beta_computer.move(board) in [14, 18]
+
+
+def test_alpha_beta_computer_stops_at_time_budget():
+    alpha_beta_computer = players.AlphaBetaComputer(seed=1, time_budget=0.01)
+    alpha_beta_computer.token = "X"
+    board = MNKBoard(15, 15, 5)
+    board[112] = "O"
+
+    start = time.perf_counter()
+    move = alpha_beta_computer.move(board)
+    assert time.perf_counter() - start < 0.1
+    assert move in board.available()
+
+
+def test_alpha_beta_computer_uses_evaluation_function():
+    def prefer_corner(board, token):
+        if board.mask(token) & 1:
+            return 1
+        return -1 if board.masks[0] & 1 or board.masks[1] & 1 else 0
+
+    alpha_beta_computer = players.AlphaBetaComputer(
+        seed=1, max_depth=1, evaluate=prefer_corner
+    )
+    alpha_beta_computer.token = "X"
+    board = MNKBoard(5, 5, 4)
+    assert alpha_beta_computer.move(board) == 0
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_alpha_beta_computer_never_loses_on_small_board(seed):
+    alpha_beta_computer = players.AlphaBetaComputer(seed=seed)
+    computers = [players.SolverComputer(seed=seed), alpha_beta_computer]
+    if seed % 2:
+        computers.reverse()
+    assert engine.play(*computers).winner is None
+
+
+def test_search_tree_leaves_board_unchanged():
+    board = MNKBoard(4, 4, 3)
+    board[5], board[6] = "X", "O"
+    visits = players.search_tree(board, "X", rollouts=500, seed=1)
+    assert sum(visits.values()) == 500
+    assert set(visits) == set(board.available())
+    assert board.moves == [(5, "X"), (6, "O")]
+    assert board.available() == [s for s in range(16) if s not in (5, 6)]
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_mcts_computer_never_loses_on_small_board(seed):
+    mcts_computer = players.MCTSComputer(seed=seed)
+    computers = [players.SolverComputer(seed=seed), mcts_computer]
+    if seed % 2:
+        computers.reverse()
+    assert engine.play(*computers).winner is None
+
+
+def test_mcts_computer_with_workers_is_repeatable():
+    moves = []
+    for _ in range(2):
+        mcts_computer = players.MCTSComputer(seed=7, rollouts=300, workers=2)
+        mcts_computer.token = "O"
+        board = MNKBoard(6, 7, 4)
+        board[38] = "X"
+        try:
+            moves.append(mcts_computer.move(board))
+        finally:
+            mcts_computer.close()
+    assert moves[0] == moves[1]
+    assert moves[0] in board.available()
+
+
+def test_decision_cache_evicts_least_recently_used():
+    cache = players.DecisionCache(maxsize=2)
+    cache.put("a", (1,))
+    cache.put("b", (2,))
+    assert cache.get("a") == (1,)
+    cache.put("c", (3,))
+    assert cache.get("b") is None
+    assert cache.get("a") == (1,)
+    assert cache.info() == players.CacheInfo(
+        hits=2, misses=1, evictions=1, size=2, maxsize=2
+    )
+
+
+@pytest.fixture
+def cached_classes():
+    classes = [players.MediumComputer, players.HardComputer]
+    yield [cls.enable_cache(maxsize=64) for cls in classes]
+    for cls in classes:
+        cls.disable_cache()
+
+
+def play_seeded_games(n_games):
+    player1 = players.HardComputer(seed=3)
+    player2 = players.MediumComputer(seed=4)
+    return [result.moves for result in engine.play_many(player1, player2, n_games)]
+
+
+def test_cached_players_make_the_same_moves(cached_classes):
+    cached = play_seeded_games(200)
+    for cache in cached_classes:
+        assert cache.hits > 0
+        assert cache.misses <= 64 + cache.evictions
+
+    players.MediumComputer.disable_cache()
+    players.HardComputer.disable_cache()
+    assert play_seeded_games(200) == cached
+
+
+def test_decision_cache_is_shared_by_class(cached_classes):
+    medium_cache, hard_cache = cached_classes
+    board = Board()
+    board[0] = "X"
+    for seed in range(3):
+        computer = players.MediumComputer(seed=seed)
+        computer.token = "O"
+        computer.move(board)
+    assert medium_cache.info()[:2] == (2, 1)
+    assert hard_cache.info()[:2] == (0, 0)
+
+
+def test_decision_cache_on_base_class_keeps_classes_apart():
+    cache = players.Computer.enable_cache()
+    try:
+        medium, hard = players.MediumComputer(), players.HardComputer()
+        medium.token, hard.token = "X", "X"
+        assert medium.move(Board()) == 4
+        assert hard.move(Board()) in {0, 2, 6, 8}
+        assert cache.info().size == 2
+        assert play_seeded_games(50) == [
+            result.moves
+            for result in engine.play_many(
+                players.HardComputer(seed=3), players.MediumComputer(seed=4), 50
+            )
+        ]
+    finally:
+        players.Computer.disable_cache()
+
+
+def random_boards(n_boards, seed, make_board=Board):
+    prng = random.Random(seed)
+    boards = []
+    while len(boards) < n_boards:
+        board = make_board()
+        for turn in range(2 * prng.randrange(5)):  # X to move
+            board.push(prng.choice(board.available()), "XO"[turn % 2])
+            if board.is_over():
+                break
+        if not board.is_over():
+            boards.append(board)
+    return boards
+
+
+def mnk_board():
+    return MNKBoard(4, 4, 3)
+
+
+@pytest.mark.parametrize(
+    "computer_class,make_board",
+    [
+        (players.EasyComputer, Board),
+        (players.MediumComputer, Board),
+        (players.HardComputer, Board),
+        (players.EasyComputer, mnk_board),
+        (players.MediumComputer, mnk_board),
+    ],
+)
+def test_move_many_makes_the_same_moves_as_move(computer_class, make_board):
+    boards = random_boards(500, seed=5, make_board=make_board)
+    sequential, batched = computer_class(seed=6), computer_class(seed=6)
+    for computer in [sequential, batched]:
+        computer.token = "X"
+    expected = [sequential.move(board) for board in boards]
+    assert batched.move_many(boards) == expected
@@ -0,0 +1,34 @@
+import pytest
+from tictactoe import engine, players
+from tictactoe.board import Board, Move
+
+
+def test_play_returns_winner_moves_and_pattern():
+    player1, player2 = players.SolverComputer(seed=1), players.EasyComputer(seed=1)
+    board = Board()
+    for space, token in [(0, "X"), (3, "O"), (1, "X"), (4, "O")]:
+        board[space] = token
+
+    result = engine.play(player1, player2, board=board)
+    assert result.winner is player1
+    assert result.moves[-1] == Move(2, "X")
+    assert result.pattern == (0, 1, 2)
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_solver_computers_always_tie(seed):
+    result = engine.play(
+        players.SolverComputer(seed=seed), players.SolverComputer(seed=seed + 100)
+    )
+    assert result.winner is None
+    assert result.pattern is None
+    assert len(result.moves) == 9
+
+
+def test_play_many_is_repeatable():
+    def play_games(seed):
+        player1 = players.EasyComputer(seed=seed)
+        player2 = players.MediumComputer(seed=seed)
+        return [result.moves for result in engine.play_many(player1, player2, 100)]
+
+    assert play_games(seed=1) == play_games(seed=1)
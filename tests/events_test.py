@@ -0,0 +1,59 @@
+import json
+
+import pytest
+from tictactoe import events
+
+
+@pytest.fixture
+def log_file(tmpdir):
+    log_file = tmpdir.join("events.jsonl")
+    yield log_file
+    events.disable()
+
+
+def read_events(log_file):
+    return [json.loads(line) for line in log_file.read().splitlines()]
+
+
+def test_events_are_written_as_json_lines(log_file):
+    events.enable(str(log_file))
+    events.log("move", "X placed a token on 4", player="X", space=4)
+    events.log("result", "Game ended in a tie", winner=None)
+    events.flush()
+
+    move, result = read_events(log_file)
+    assert move["event"] == "move"
+    assert (move["player"], move["space"]) == ("X", 4)
+    assert move["message"] == "X placed a token on 4"
+    assert result["winner"] is None
+    assert isinstance(result["time"], float)
+
+
+def test_events_are_written_in_batches(log_file):
+    event_log = events.enable(str(log_file), capacity=3)
+    for i in range(2):
+        events.log("move", f"move {i}", space=i)
+    event_log.queue.join()  # the listener has handled both events
+    assert log_file.read() == ""
+
+    events.log("move", "move 2", space=2)
+    event_log.queue.join()
+    assert [event["space"] for event in read_events(log_file)] == [0, 1, 2]
+
+
+def test_enabling_a_new_file_closes_the_old_one(log_file, tmpdir):
+    events.enable(str(log_file))
+    events.log("start", "first")
+    other_file = tmpdir.join("other.jsonl")
+    events.enable(str(other_file))
+    events.log("start", "second")
+    events.flush()
+
+    assert [event["message"] for event in read_events(log_file)] == ["first"]
+    assert [event["message"] for event in read_events(other_file)] == ["second"]
+
+
+def test_events_are_not_written_when_disabled(log_file):
+    events.log("start", "nobody is listening")
+    events.flush()
+    assert not log_file.exists()
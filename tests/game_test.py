@@ -1,8 +1,11 @@
 """Functional tests of people playing the game."""
-from unittest.mock import Mock
+import json
+import time
+from unittest.mock import Mock, call
 import pytest
 
-from tictactoe import app, screens, players, exceptions
+from tictactoe import app, instrument, records, screens, players, exceptions
+from tictactoe.board import Board
 from tictactoe.screens import Screen
 
 
@@ -119,12 +122,13 @@ def test_switch_order(stdscr, logging_game):
 
 
 @pytest.mark.parametrize("seed1,seed2", zip(range(1, 10), range(11, 20)))
-def test_hard_ai_always_ties(stdscr, logging_game, seed1, seed2):
-    app.create_players_from_game_type = Mock()
-    app.create_players_from_game_type.return_value = (
+def test_hard_ai_always_ties(stdscr, logging_game, seed1, seed2, monkeypatch):
+    create_players = Mock()
+    create_players.return_value = (
         players.HardComputer("Computer 1", seed=seed1),
         players.HardComputer("Computer 2", seed=seed2),
     )
+    monkeypatch.setattr(app, "create_players_from_game_type", create_players)
 
     stdscr.getkey.side_effect = [
         "3",  # Computer v Computer game type
@@ -139,3 +143,236 @@ def test_hard_ai_always_ties(stdscr, logging_game, seed1, seed2):
     ]
     logging_game(stdscr)
     assert "Game ended in a tie" in logging_game.read_log()
+
+
+def test_difficulty_screen_replaces_computer_players(stdscr, monkeypatch):
+    monkeypatch.setattr(Screen, "choice_delay", 0)
+    player1 = players.Computer("Computer 1", seed=1)
+    player2 = players.Computer("Computer 2", seed=2)
+    for player, token, color_ix in [(player1, "X", 2), (player2, "O", 3)]:
+        player.token, player.color_ix = token, color_ix
+
+    stdscr.getkey.side_effect = ["4", "2"]
+    difficulty_screen = screens.DifficultyScreen(
+        screens.CursesWindow(stdscr), player1, player2
+    )
+    player1, player2 = difficulty_screen.update_computer_difficulties()
+    assert isinstance(player1, players.SolverComputer)
+    assert isinstance(player2, players.MediumComputer)
+    assert (player1.token, player2.token) == ("X", "O")
+    assert (player1.seed, player2.seed) == (1, 2)
+
+
+def test_games_are_recorded(stdscr, tmpdir):
+    record_file = str(tmpdir.join("games.rec"))
+    game = app.Game(record_file=record_file)
+    Screen.choice_delay = 0  # fast mode
+    stdscr.getkey.side_effect = [
+        "2",  # Human v Human game type
+        "x",  # Player 1 token
+        "o",  # Player 2 token
+        "1",  # Player 1 goes first
+        "0",  # Player 1 turn
+        "3",  # Player 2 turn
+        "1",  # Player 1 turn
+        "4",  # Player 2 turn
+        "2",  # Player 1 turn
+        "\n",  # Player 1 wins screen
+        "q",  # Any key to quit
+    ]
+    game(stdscr)
+    assert game.record_writer.f.closed
+
+    with open(record_file, "rb") as f:
+        (record,) = records.read_records(f)
+    assert record.tokens == ("X", "O")
+    assert record.player_types == ("Human", "Human")
+    assert record.moves == [0, 3, 1, 4, 2]
+
+
+def test_human_move_clears_error_message(stdscr):
+    board = Board()
+    player1, player2 = players.Human("Player 1"), players.Human("Player 2")
+    for player, token, color_ix in [(player1, "X", 2), (player2, "O", 3)]:
+        player.token, player.color_ix = token, color_ix
+    board[0] = "X"
+    stdscr.getkey.side_effect = ["0", "1"]  # taken, then open
+    play_screen = screens.PlayScreen(stdscr, board, player1, player2, move_delay=0)
+
+    assert play_screen.get_human_move(player1) == 1
+    calls = stdscr.mock_calls
+    error_ix = max(i for i, c in enumerate(calls) if "already placed" in str(c))
+    assert call.move(play_screen.error_y, 0) in calls[error_ix:]
+
+
+def test_key_pressed_after_human_move_is_kept(stdscr):
+    board = Board()
+    player1, player2 = players.Human("Player 1"), players.Human("Player 2")
+    for player, token, color_ix in [(player1, "X", 2), (player2, "O", 3)]:
+        player.token, player.color_ix = token, color_ix
+    stdscr.getkey.side_effect = ["0", "3"]  # Player 2 presses 3 during the pause
+    play_screen = screens.PlayScreen(stdscr, board, player1, player2, move_delay=5)
+
+    start = time.monotonic()
+    play_screen.move_player(player1)
+    assert time.monotonic() - start < 1
+    screens.curses.ungetch.assert_called_once_with("3")
+
+
+def test_board_window_only_redraws_changed_cells(stdscr):
+    board = Board()
+    board_window = screens.BoardWindow(Mock(), board)
+    board_window.draw()
+    assert board_window.w.addstr.call_count == 5 + 9  # grid lines and cells
+
+    board_window.w.reset_mock()
+    board[4] = "X"
+    board_window.draw()
+    board_window.w.addstr.assert_called_once_with(2, 5, "X", screens.curses.A_NORMAL)
+    board_window.w.clear.assert_not_called()
+    board_window.w.noutrefresh.assert_called_once()
+    screens.curses.doupdate.assert_called()
+
+    board_window.w.reset_mock()
+    board_window.draw()
+    board_window.w.addstr.assert_not_called()
+
+    board_window.highlight_square(4, player_color_ix=2)
+    board_window.draw()
+    assert board_window.w.addstr.call_count == 1  # the highlight is redrawn
+
+
+class KeyboardWindow:
+    """A window where keys are pressed at set times after it's created."""
+
+    def __init__(self, keys_at=None):
+        self.start = time.monotonic()
+        self.keys_at = list(keys_at or [])  # (seconds, key)
+        self.delay = -1
+        self.n_reads = 0
+
+    def timeout(self, delay):
+        self.delay = delay
+
+    def getkey(self):
+        self.n_reads += 1
+        if self.keys_at:
+            at, key = self.keys_at[0]
+            wait = self.start + at - time.monotonic()
+            if wait <= self.delay / 1000:
+                time.sleep(max(wait, 0))
+                self.keys_at.pop(0)
+                return key
+        time.sleep(self.delay / 1000)
+        raise screens.curses.error("no input")
+
+
+def test_scheduler_runs_events_in_order():
+    scheduler = screens.Scheduler(KeyboardWindow())
+    calls = []
+    scheduler.call_later(0.02, lambda: calls.append(2))
+    scheduler.call_later(0.01, lambda: calls.append(1))
+    scheduler.call_later(1.0, lambda: calls.append(3))
+    assert scheduler.wait(0.05) is None
+    assert calls == [1, 2]
+
+
+def test_scheduler_wait_can_be_skipped():
+    scheduler = screens.Scheduler(KeyboardWindow(keys_at=[(0.01, " ")]))
+    start = time.monotonic()
+    assert scheduler.wait(5) == " "
+    assert time.monotonic() - start < 1
+
+
+def test_scheduler_quits_immediately():
+    scheduler = screens.Scheduler(KeyboardWindow(keys_at=[(0.01, "Q")]))
+    with pytest.raises(exceptions.PlayerQuitException):
+        scheduler.wait(5, skippable=False)
+
+
+def test_scheduler_does_not_read_keys_without_delay():
+    window = KeyboardWindow(keys_at=[(0, "q")])
+    assert screens.Scheduler(window).wait(0) is None
+    assert window.n_reads == 0
+
+
+def test_computer_games_can_run_at_full_speed(stdscr, monkeypatch):
+    monkeypatch.setattr(Screen, "choice_delay", 10)
+    board = Board()
+    computer1, computer2 = players.HardComputer(), players.HardComputer()
+    for computer, token, color_ix in [(computer1, "X", 2), (computer2, "O", 3)]:
+        computer.token, computer.color_ix = token, color_ix
+    stdscr.getkey.return_value = "\n"  # press any key at the end
+    play_screen = screens.PlayScreen(stdscr, board, computer1, computer2, move_delay=0)
+
+    start = time.monotonic()
+    play_screen.play()
+    assert time.monotonic() - start < 1
+    assert board.is_tie() and not board.is_over()
+
+
+def test_play_again_reuses_the_session(stdscr, logging_game):
+    player1_wins = ["0", "3", "1", "4", "2"]
+    tie = ["0", "1", "2", "4", "3", "5", "7", "6", "8"]
+    stdscr.getkey.side_effect = (
+        ["2", "x", "o", "1"]  # Human v Human, tokens, Player 1 goes first
+        + player1_wins
+        + ["\n", "\n"]  # Player 1 wins screen, play again
+        + tie
+        + ["\n", "\n"]  # Tie screen, play again
+        + player1_wins
+        + ["\n", "q"]  # Player 1 wins screen, exit
+    )
+    logging_game(stdscr)
+
+    session = logging_game.session
+    assert session.rounds == 3
+    assert session.totals(session.player1) == (2, 1, 0)
+    assert session.totals(session.player2) == (0, 1, 2)
+    assert logging_game.read_log().count("Starting a new game") == 1
+    assert "Game over" in logging_game.read_log()
+
+
+def test_game_events_are_structured(stdscr, logging_game):
+    stdscr.getkey.side_effect = [
+        "2",  # Human v Human game type
+        "x",  # Player 1 token
+        "o",  # Player 2 token
+        "1",  # Player 1 goes first
+        "0",  # Player 1 turn
+        "3",  # Player 2 turn
+        "q",  # quit
+    ]
+    logging_game(stdscr)
+    log = [json.loads(line) for line in logging_game.read_log().splitlines()]
+    assert [event["event"] for event in log] == [
+        "start",
+        "setup",
+        "token",
+        "token",
+        "order",
+        "move",
+        "move",
+        "quit",
+    ]
+    assert log[5]["player"] == "Player 1"
+    assert (log[6]["token"], log[6]["space"]) == ("O", 3)
+
+
+def test_session_shows_move_latencies(stdscr):
+    computer1, computer2 = players.HardComputer(), players.EasyComputer()
+    for computer, token, color_ix in [(computer1, "X", 2), (computer2, "O", 3)]:
+        computer.token, computer.color_ix = token, color_ix
+    stdscr.getkey.return_value = "q"  # don't play again
+    window = screens.CursesWindow(stdscr)
+    try:
+        session = app.Session(
+            window, computer1, computer2, move_delay=0, latencies=instrument.enable()
+        )
+        session.run()
+    finally:
+        instrument.disable()
+
+    assert session.rounds == 1
+    drawn = [str(call) for call in stdscr.addstr.call_args_list]
+    assert any("HardComputer" in text and "move" in text for text in drawn)
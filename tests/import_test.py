@@ -0,0 +1,43 @@
+import os
+import subprocess
+import sys
+
+import tictactoe
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+
+def run_python(code):
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    return subprocess.run(
+        [sys.executable, "-c", code], env=env, capture_output=True, text=True
+    )
+
+
+def test_core_modules_import_without_curses():
+    # Importing a module that is None in sys.modules raises ImportError
+    result = run_python(
+        "import sys; sys.modules['curses'] = sys.modules['_curses'] = None\n"
+        "import tictactoe.board, tictactoe.players, tictactoe.patterns\n"
+        "import tictactoe.engine, tictactoe.records, tictactoe.tournament\n"
+        "print(sorted(m for m in sys.modules if m.startswith('tictactoe.')))"
+    )
+    assert result.returncode == 0, result.stderr
+    assert "tictactoe.app" not in result.stdout
+    assert "tictactoe.screens" not in result.stdout
+
+
+def test_game_is_imported_on_first_use():
+    result = run_python(
+        "import sys, tictactoe\n"
+        "assert 'tictactoe.app' not in sys.modules\n"
+        "tictactoe.Game\n"
+        "assert 'tictactoe.app' in sys.modules"
+    )
+    assert result.returncode == 0, result.stderr
+
+
+def test_package_has_game():
+    from tictactoe.app import Game
+
+    assert tictactoe.Game is Game
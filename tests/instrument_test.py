@@ -0,0 +1,110 @@
+import json
+
+import pytest
+
+from tictactoe import engine, instrument, players, tablebase, tournament
+from tictactoe.board import Board
+
+
+@pytest.fixture(autouse=True)
+def disabled():
+    yield
+    instrument.disable()
+
+
+def test_methods_are_not_wrapped_until_enabled():
+    move = players.HardComputer.move
+    assert not instrument.is_enabled()
+    with instrument.recording():
+        assert players.HardComputer.move is not move
+    assert players.HardComputer.move is move
+    assert not instrument.is_enabled()
+
+
+def test_moves_are_counted_by_player_and_turn():
+    with instrument.recording() as recorder:
+        for _ in range(3):
+            engine.play(players.HardComputer(seed=1), players.EasyComputer(seed=2))
+    snapshot = recorder.snapshot()
+    assert snapshot["HardComputer", "move", 0].count == 3
+    assert snapshot["EasyComputer", "move", 1].count == 3
+    assert ("HardComputer", "move", 1) not in snapshot
+    assert snapshot["HardComputer", "find_winning_move", 2].count >= 3
+    stats = snapshot["HardComputer", "move", 0]
+    assert sum(stats.buckets) == stats.count
+    assert 0 < stats.max_ns <= stats.total_ns
+
+
+def test_calls_to_super_are_timed_once(tmp_path):
+    path = str(tmp_path / "tablebase.bin")
+    tablebase.build(path)
+    computer = players.TablebaseComputer(seed=1)
+    computer.path = path
+    computer.token = "X"
+    board = Board()
+    board[0] = "O"
+    board[1] = "O"  # not in the tablebase, so the solver's move is called
+    with instrument.recording() as recorder:
+        assert computer.move(board) == 2
+    assert {key: stats.count for key, stats in recorder.snapshot().items()} == {
+        ("TablebaseComputer", "move", 2): 1
+    }
+
+
+def test_recording_restores_the_enabled_recorder():
+    outer = instrument.enable()
+    with instrument.recording() as inner:
+        players.EasyComputer().move(Board(tokens=["X", "O"]))
+    assert instrument.is_enabled()
+    assert not outer.snapshot() and inner.snapshot()
+
+
+def test_merge_adds_snapshots():
+    recorder = instrument.Recorder()
+    recorder.add(("Easy", "move", 0), 3)
+    recorder.add(("Easy", "move", 0), 100)
+    recorder.merge(recorder.snapshot())
+    stats = recorder.snapshot()["Easy", "move", 0]
+    assert stats.count == 4
+    assert stats.total_ns == 206
+    assert stats.max_ns == 100
+    assert stats.buckets[2] == stats.buckets[7] == 2
+
+
+def test_percentile_is_an_upper_bound():
+    recorder = instrument.Recorder()
+    for ns in [100] * 99 + [5000]:
+        recorder.add(("Easy", "move", 0), ns)
+    stats = recorder.snapshot()["Easy", "move", 0]
+    assert instrument.percentile(stats, 50) == 128
+    assert instrument.percentile(stats, 99) == 128
+    assert instrument.percentile(stats, 100) == 8192
+
+
+def test_snapshots_are_exported_as_text_and_json():
+    recorder = instrument.Recorder()
+    recorder.add(("HardComputer", "move", 0), 2000)
+    recorder.add(("HardComputer", "move", 2), 4000)
+    snapshot = recorder.snapshot()
+
+    lines = instrument.format_text(snapshot).splitlines()
+    assert lines[0].split()[:4] == ["player", "method", "turn", "calls"]
+    assert len(lines) == 3
+    summary = instrument.format_text(snapshot, turns=False).splitlines()
+    assert summary[1].split()[:5] == ["HardComputer", "move", "all", "2", "3.0"]
+
+    dump = json.loads(instrument.to_json(snapshot))
+    assert [(row["turn"], row["count"]) for row in dump] == [(0, 1), (2, 1)]
+    assert dump[1]["buckets"] == {"12": 1}
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_tournament_merges_latencies_from_workers(workers):
+    latencies = instrument.Recorder()
+    results = tournament.run(
+        5, names=["Easy"], workers=workers, chunk_size=2, latencies=latencies
+    )
+    moves = instrument.by_method(latencies.snapshot())["EasyComputer", "move"]
+    assert sum(results["Easy", "Easy"]) == 5
+    assert moves.count >= 5 * 5  # every game has at least 5 moves
+    assert not instrument.is_enabled()
@@ -0,0 +1,19 @@
+from tictactoe import patterns
+
+
+def test_win_table_matches_winning_patterns():
+    for mask in range(512):
+        expected = any(mask & line == line for line in patterns.winning_masks)
+        assert patterns.win_table[mask] == expected
+
+
+def test_winning_lines_give_the_completed_pattern():
+    for pattern in patterns.winning_patterns:
+        assert patterns.winning_lines[patterns.make_mask(pattern)] == pattern
+    assert patterns.winning_lines[0b000000011] is None
+
+
+def test_completing_masks_match_partial_patterns():
+    for (s1, s2), s3 in patterns.partial_patterns.items():
+        mask = patterns.make_mask((s1, s2))
+        assert patterns.completing_masks[mask] == 1 << s3
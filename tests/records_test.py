@@ -0,0 +1,51 @@
+import io
+
+import pytest
+from tictactoe import engine, players, records
+
+
+def test_records_round_trip():
+    record = records.GameRecord(
+        tokens=("A", "B"),
+        player_types=("Human", "Computer"),
+        difficulties=(None, "Hard"),
+        seeds=(None, -12),
+        moves=[4, 0, 8, 2, 1],
+    )
+    decoded, offset = records.decode_from(records.encode(record))
+    assert decoded == record
+    assert offset == len(records.encode(record))
+
+
+def test_records_use_a_nibble_per_move():
+    record = records.GameRecord(
+        ("X", "O"), ("Human", "Human"), (None, None), (None, None), list(range(9))
+    )
+    assert len(records.encode(record)) == records.RECORD_HEADER.size + 5
+
+
+def test_writer_appends_records_from_engine():
+    f = io.BytesIO()
+    writer = records.RecordWriter(f)
+    player1, player2 = players.EasyComputer(seed=1), players.HardComputer(seed=2)
+    results = list(engine.play_many(player1, player2, 10, writer=writer))
+
+    f.seek(0)
+    recorded = list(records.read_records(f))
+    assert [r.moves for r in recorded] == [
+        [move.space for move in result.moves] for result in results
+    ]
+    assert recorded[0].difficulties == ("Easy", "Hard")
+    assert recorded[0].seeds == (1, 2)
+
+
+def test_replay_rebuilds_the_board():
+    player1, player2 = players.SolverComputer(seed=1), players.EasyComputer(seed=1)
+    result = engine.play(player1, player2)
+    record = records.make_record(player1, player2, result.moves)
+    assert records.replay(record).moves == result.moves
+
+
+def test_reader_rejects_other_files():
+    with pytest.raises(records.RecordFormatError):
+        list(records.read_records(io.BytesIO(b"Computer placed a token on 4")))
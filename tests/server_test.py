@@ -0,0 +1,128 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from tictactoe import server
+
+
+async def connect(game_server):
+    port = await game_server.start()
+    return await asyncio.open_connection("127.0.0.1", port)
+
+
+async def send(reader, writer, line):
+    writer.write(line.encode() + b"\n")
+    await writer.drain()
+    return (await reader.readline()).decode().split()
+
+
+def run_with_client(game_server, session):
+    async def main():
+        reader, writer = await connect(game_server)
+        try:
+            return await session(reader, writer)
+        finally:
+            writer.close()
+            await game_server.close()
+
+    return asyncio.run(main())
+
+
+def test_server_plays_a_game():
+    async def session(reader, writer):
+        ok, game_id, board, status = await send(reader, writer, "NEW Medium")
+        assert (ok, board, status) == ("OK", ".........", "playing")
+
+        ok, _, board, status = await send(reader, writer, f"MOVE {game_id} 0")
+        assert board[0] == "X"
+        assert board[4] == "O"  # medium computer takes the center
+        assert status == "playing"
+
+        reply = await send(reader, writer, f"STATE {game_id}")
+        assert reply == ["OK", game_id, board, status]
+
+    run_with_client(server.GameServer(), session)
+
+
+def test_computer_moves_first_when_client_plays_o():
+    async def session(reader, writer):
+        ok, game_id, board, status = await send(reader, writer, "NEW Hard O")
+        assert board.count("X") == 1 and board.count("O") == 0
+
+    run_with_client(server.GameServer(), session)
+
+
+def test_server_reports_errors():
+    async def session(reader, writer):
+        _, game_id, _, _ = await send(reader, writer, "NEW Easy")
+        await send(reader, writer, f"MOVE {game_id} 4")
+        replies = [
+            await send(reader, writer, f"MOVE {game_id} 4"),
+            await send(reader, writer, f"MOVE {game_id} 9"),
+            await send(reader, writer, "MOVE 999 1"),
+            await send(reader, writer, "NEW Impossible"),
+            await send(reader, writer, "JUMP"),
+        ]
+        return [reply[:2] for reply in replies]
+
+    assert run_with_client(server.GameServer(), session) == [
+        ["ERR", "SpotAlreadySelectedError"],
+        ["ERR", "KeyNotOnBoardError"],
+        ["ERR", "ProtocolError"],
+        ["ERR", "ProtocolError"],
+        ["ERR", "ProtocolError"],
+    ]
+
+
+def test_resigned_games_are_forgotten():
+    game_server = server.GameServer()
+
+    async def session(reader, writer):
+        _, game_id, _, _ = await send(reader, writer, "NEW")
+        assert await send(reader, writer, f"RESIGN {game_id}") == [
+            "OK",
+            game_id,
+            ".........",
+            "resigned",
+        ]
+        return game_id
+
+    run_with_client(game_server, session)
+    assert game_server.sessions == {}
+
+
+def test_idle_sessions_expire():
+    game_server = server.GameServer(idle_timeout=0.01)
+
+    async def session(reader, writer):
+        _, game_id, _, _ = await send(reader, writer, "NEW")
+        assert game_id in game_server.sessions
+        await asyncio.sleep(0.05)
+        return await send(reader, writer, f"STATE {game_id}")
+
+    assert run_with_client(game_server, session)[:2] == ["ERR", "ProtocolError"]
+
+
+def test_server_hosts_concurrent_games_with_executor():
+    game_server = server.GameServer(executor=ThreadPoolExecutor(4))
+
+    async def play(port):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        _, game_id, _, status = await send(reader, writer, "NEW Hard")
+        while status == "playing":
+            board = (await send(reader, writer, f"STATE {game_id}"))[2]
+            space = board.index(".")
+            _, _, _, status = await send(reader, writer, f"MOVE {game_id} {space}")
+        writer.close()
+        return status
+
+    async def main():
+        port = await game_server.start()
+        try:
+            return await asyncio.gather(*[play(port) for _ in range(50)])
+        finally:
+            await game_server.close()
+
+    statuses = asyncio.run(main())
+    assert len(statuses) == 50
+    assert "won:X" not in statuses  # the hard computer never loses
+    assert game_server.sessions == {}
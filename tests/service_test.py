@@ -0,0 +1,90 @@
+import json
+import threading
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock
+
+import pytest
+from tictactoe import service
+
+
+@pytest.fixture(scope="module")
+def move_server():
+    move_server = service.MoveServer(("127.0.0.1", 0), window=0.005, seed=1)
+    thread = threading.Thread(target=move_server.serve_forever, daemon=True)
+    thread.start()
+    yield move_server
+    move_server.shutdown()
+    move_server.server_close()
+    thread.join()
+
+
+def post(move_server, query, path="/move"):
+    host, port = move_server.server_address
+    request = urllib.request.Request(
+        f"http://{host}:{port}{path}", data=json.dumps(query).encode()
+    )
+    try:
+        with urllib.request.urlopen(request) as response:
+            return response.status, json.load(response)
+    except urllib.error.HTTPError as err:
+        return err.code, json.load(err)
+
+
+def test_service_answers_one_position(move_server):
+    status, reply = post(move_server, {"difficulty": "Medium", "position": [0]})
+    assert status == 200
+    assert reply == {"move": 4}
+
+
+def test_service_answers_many_positions(move_server):
+    positions = [[0, 3, 1], [0, 4, 8, 1, 2], []]
+    status, reply = post(move_server, {"difficulty": "Hard", "positions": positions})
+    assert status == 200
+    assert reply["moves"][:2] == [2, 7]
+    assert reply["moves"][2] in [0, 2, 6, 8]
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        {"position": [0, 0]},
+        {"position": [9]},
+        {"position": [0, 3, 1, 4, 2]},
+        {"position": [0, 3, 1, 4, 2, 5]},
+        {"position": "0 1"},
+        {"positions": [[0], ["a"]]},
+        {"position": [True]},
+        {"difficulty": "Impossible"},
+        {"difficulty": ["Hard"], "position": []},
+        [],
+    ],
+)
+def test_service_rejects_bad_queries(move_server, query):
+    status, reply = post(move_server, query)
+    assert status == 400
+    assert "error" in reply
+
+
+def test_service_reports_unexpected_errors(move_server, monkeypatch):
+    computer = move_server.batcher.computers["Easy", "X"]
+    monkeypatch.setattr(computer, "move_many", Mock(side_effect=RuntimeError("oops")))
+    status, reply = post(move_server, {"difficulty": "Easy", "position": []})
+    assert status == 500
+    assert reply == {"error": "RuntimeError: oops"}
+
+
+def test_service_rejects_unknown_paths(move_server):
+    assert post(move_server, {}, path="/best")[0] == 404
+
+
+def test_service_batches_concurrent_requests(move_server):
+    queries = [{"difficulty": "Easy", "position": [s]} for s in range(9)] * 10
+    n_batches = move_server.batcher.n_batches
+    with ThreadPoolExecutor(30) as executor:
+        replies = list(executor.map(lambda query: post(move_server, query), queries))
+    for query, (status, reply) in zip(queries, replies):
+        assert status == 200
+        assert reply["move"] != query["position"][0]
+    assert move_server.batcher.n_batches - n_batches < len(queries)
@@ -0,0 +1,63 @@
+import pytest
+from tictactoe import patterns, players, tablebase
+from tictactoe.board import Board
+
+
+@pytest.fixture(scope="module")
+def tablebase_path(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("tablebase") / "tablebase.bin")
+    tablebase.build(path)
+    return path
+
+
+def test_tablebase_has_every_reachable_position():
+    assert len(list(tablebase.reachable_positions())) == 5478
+
+
+def test_tablebase_solves_empty_board(tablebase_path):
+    entry = tablebase.open_tablebase(tablebase_path)[Board().code()]
+    assert entry == tablebase.Entry(tablebase.DRAW, 9, patterns.full_mask)
+
+
+def test_tablebase_finds_fastest_win(tablebase_path):
+    board = Board()
+    for space, token in [(0, "X"), (3, "O"), (1, "X"), (4, "O")]:
+        board[space] = token
+    entry = tablebase.open_tablebase(tablebase_path)[board.code()]
+    assert entry == tablebase.Entry(tablebase.WIN, 1, 1 << 2)
+
+
+def test_tablebase_skips_unreachable_positions(tablebase_path):
+    board = Board()
+    board[0] = "O"  # second player can't move first
+    assert tablebase.open_tablebase(tablebase_path)[board.code()] is None
+
+
+def test_missing_default_tablebase_is_built_in_memory(tmp_path, monkeypatch):
+    path = tmp_path / "tablebase.bin"
+    monkeypatch.setattr(tablebase, "default_path", str(path))
+    monkeypatch.setattr(tablebase, "_tablebases", {})
+    entry = tablebase.open_tablebase()[Board().code()]
+    assert entry == tablebase.Entry(tablebase.DRAW, 9, patterns.full_mask)
+    assert not path.exists()
+
+
+def test_missing_tablebase_file_is_an_error(tmp_path):
+    with pytest.raises(FileNotFoundError, match="python -m tictactoe.tablebase"):
+        tablebase.open_tablebase(str(tmp_path / "tablebase.bin"))
+
+
+def test_tablebase_computer_plays_like_solver(tablebase_path):
+    computer = players.TablebaseComputer(seed=1)
+    computer.path = tablebase_path
+    computer.token = "O"
+    board = Board()
+    board[0] = "X"
+    assert computer.move(board) == 4
+
+    # positions outside the tablebase fall back to the solver
+    computer.token = "X"
+    board = Board()
+    board[0] = "O"
+    board[1] = "O"
+    assert computer.move(board) == 2
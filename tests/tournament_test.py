@@ -0,0 +1,41 @@
+from tictactoe import tournament
+
+
+def test_tournament_plays_both_seat_orders():
+    results = tournament.run(
+        10, names=["Easy", "Medium"], workers=1, seed=1, chunk_size=3
+    )
+    assert set(results) == {
+        ("Easy", "Easy"),
+        ("Easy", "Medium"),
+        ("Medium", "Easy"),
+        ("Medium", "Medium"),
+    }
+    assert all(sum(tally) == 10 for tally in results.values())
+
+
+def test_tournament_results_do_not_depend_on_workers():
+    kwargs = dict(names=["Easy", "Hard"], seed=7, chunk_size=25)
+    assert tournament.run(100, workers=1, **kwargs) == tournament.run(
+        100, workers=2, **kwargs
+    )
+
+
+def test_tournament_streams_chunk_tallies():
+    tallies = []
+    tournament.run(
+        10,
+        names=["Easy"],
+        workers=1,
+        chunk_size=4,
+        on_result=lambda *tally: tallies.append(tally),
+    )
+    assert [sum(tally[2:]) for tally in tallies] == [4, 4, 2]
+
+
+def test_format_matrix_labels_rows_and_columns():
+    results = {("Easy", "Easy"): [1, 2, 3]}
+    matrix = tournament.format_matrix(results, ["Easy"])
+    assert "Easy" in matrix.splitlines()[0]
+    assert matrix.splitlines()[1].startswith("Easy")
+    assert "1/2/3" in matrix
@@ -1 +1,13 @@
-from tictactoe.app import Game
+"""Tic tac toe.
+
+The curses user interface is imported on first use of tictactoe.Game, so
+the board, players and other modules can be used without curses.
+"""
+
+
+def __getattr__(name):
+    if name == "Game":
+        from tictactoe.app import Game
+
+        return Game
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,122 @@
+"""Score every move of recorded games against perfect play.
+
+Analyze one or more record files (see tictactoe.records) with
+
+    python -m tictactoe.analyze games.rec [more.rec ...]
+
+Games are streamed from disk and replayed move by move onto a Board. Each
+move is compared with the game-theoretic value of the position before it
+was made, from the point of view of the player making it:
+
+- "threw away": the move lowered the value, e.g. from a win to a draw
+- "improved": the move kept the value, and the value is higher than it
+  was after the player's previous move, because the opponent made a mistake
+- "kept": the move kept the value the player already had
+
+Memory use is constant: only the counts and the values of positions seen
+so far are kept, and there are only 5,478 reachable positions.
+"""
+import argparse
+from collections import Counter, defaultdict
+
+from tictactoe import records, solver
+from tictactoe.board import Board
+
+
+KEPT, IMPROVED, THREW_AWAY = "kept", "improved", "threw away"
+OUTCOMES = [KEPT, IMPROVED, THREW_AWAY]
+
+
+def sign(x):
+    return (x > 0) - (x < 0)
+
+
+class Analyzer:
+    """Count move outcomes by player and by turn across many games."""
+
+    def __init__(self):
+        self.values = {}  # position values for the player to move by Board.hash
+        self.by_player = defaultdict(Counter)
+        self.by_turn = defaultdict(Counter)
+        self.n_games = 0
+
+    def value(self, board, token):
+        """Return the value of a board for the player with a token to move.
+
+        The value is 1 for a win, 0 for a draw and -1 for a loss.
+        """
+        value = self.values.get(board.hash)
+        if value is None:
+            player = board.mask(token)
+            opponent = (board.masks[0] | board.masks[1]) & ~player
+            value = self.values[board.hash] = sign(solver.negamax(player, opponent))
+        return value
+
+    def add_record(self, record):
+        """Replay a recorded game and count the outcome of every move."""
+        labels = [
+            difficulty or player_type
+            for player_type, difficulty in zip(record.player_types, record.difficulties)
+        ]
+        board = Board(tokens=list(record.tokens))
+        previous = [0, 0]  # value after each player's last move, from the start
+        for turn, space in enumerate(record.moves):
+            mover = turn % 2
+            token, opponent_token = record.tokens[mover], record.tokens[1 - mover]
+
+            before = self.value(board, token)
+            board[space] = token
+            after = -self.value(board, opponent_token)
+
+            if after < before:
+                outcome = THREW_AWAY
+            elif after > previous[mover]:
+                outcome = IMPROVED
+            else:
+                outcome = KEPT
+            previous[mover] = after
+
+            self.by_player[labels[mover]][outcome] += 1
+            self.by_turn[turn][outcome] += 1
+        self.n_games += 1
+
+    def add_records(self, game_records):
+        for record in game_records:
+            self.add_record(record)
+
+    def report(self):
+        """Format the blunder rates by player and by turn as text."""
+        lines = [f"Analyzed {self.n_games} games"]
+        for title, counts in [("player", self.by_player), ("turn", self.by_turn)]:
+            lines.append("")
+            lines.append(
+                f"{title:>10}{'moves':>10}"
+                + "".join(f"{outcome:>12}" for outcome in OUTCOMES)
+                + f"{'blunders':>10}"
+            )
+            for key in sorted(counts, key=str):
+                counter = counts[key]
+                n_moves = sum(counter.values())
+                blunder_rate = counter[THREW_AWAY] / n_moves
+                lines.append(
+                    f"{key!s:>10}{n_moves:>10}"
+                    + "".join(f"{counter[outcome]:>12}" for outcome in OUTCOMES)
+                    + f"{blunder_rate:>10.2%}"
+                )
+        return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("record_files", nargs="+", help="record files to analyze")
+    args = parser.parse_args(argv)
+
+    analyzer = Analyzer()
+    for path in args.record_files:
+        with open(path, "rb") as f:
+            analyzer.add_records(records.read_records(f))
+    print(analyzer.report())
+
+
+if __name__ == "__main__":
+    main()
@@ -1,27 +1,37 @@
 import sys
 import itertools
-import logging
-from tictactoe import players, screens, exceptions
+from tictactoe import events, instrument, players, records, screens, exceptions
 from tictactoe.board import Board
 
 
-logger = logging.getLogger("game")
-
-
 class Game:
-    def __init__(self, log_file=None):
-        """Initialize a game with the option to write to a log file.
+    def __init__(self, log_file=None, record_file=None, move_delay=None, latency=False):
+        """Initialize a game with the option to write to log and record files.
 
         Args:
-            log_file: Name of log file. If None, no log file is written.
+            log_file: Name of a JSON Lines file to log game events to. If None,
+                no log file is written.
+            record_file: Name of a binary file to append finished games to.
+                If None, games are not recorded.
+            move_delay: Seconds to pause on each move. Use 0 to play computer
+                games at full speed. If None, the screen default is used.
+            latency: Whether to time the moves of computer players and show
+                a table of their latencies at the end of each game. The
+                timings are kept in self.latencies.
         """
+        self.move_delay = move_delay
+        self.latencies = instrument.Recorder() if latency else None
         if log_file:
             enable_logging(log_file)
 
+        self.record_file = record_file
+        self.record_writer = None
+
     def __call__(self, stdscr):
         """Run the game as a terminal application in a curses window.
 
-        This is the main event loop for the game.
+        The players are set up once, and then play rounds in a Session until
+        they stop playing again.
 
         Args:
             stdscr: A curses window
@@ -31,18 +41,33 @@ class Game:
             >>> game = Game()
             >>> curses.wrapper(game)
         """
-        logger.info("Starting a new game")
+        if self.record_file:
+            self.record_writer = records.RecordWriter(open(self.record_file, "ab"))
+        if self.latencies is not None:
+            instrument.enable(self.latencies)
+        try:
+            self.run(stdscr)
+        finally:
+            events.flush()
+            if self.latencies is not None:
+                instrument.disable()
+            if self.record_writer is not None:
+                self.record_writer.close()
+
+    def run(self, stdscr):
+        events.log("start", "Starting a new game")
         screens.configure_curses()
+        window = screens.CursesWindow(stdscr)
 
         # Welcome the player and ask for game type
-        welcome_screen = screens.WelcomeScreen(screens.CursesWindow(stdscr))
+        welcome_screen = screens.WelcomeScreen(window)
         welcome_screen.draw()
         try:
             game_type = welcome_screen.get_game_type()
         except exceptions.PlayerQuitException:
             return self.quit()
 
-        logger.info(f"Setting up a {game_type} game")
+        events.log("setup", f"Setting up a {game_type} game", game_type=game_type.name)
         player1, player2 = create_players_from_game_type(game_type)
 
         # Set player colors
@@ -53,64 +78,134 @@ class Game:
         player1.token = "X"
         player2.token = "O"
 
-        token_screen = screens.TokenScreen(
-            screens.CursesWindow(stdscr), player1, player2
-        )
+        token_screen = screens.TokenScreen(window, player1, player2)
         token_screen.draw()
         token_screen.update_player_tokens()
 
         if game_has_computer_players(game_type):
             # Set computer player difficulties
-            difficulty_screen = screens.DifficultyScreen(
-                screens.CursesWindow(stdscr), player1, player2
-            )
+            difficulty_screen = screens.DifficultyScreen(window, player1, player2)
             difficulty_screen.draw()
             try:
-                difficulty_screen.update_computer_difficulties()
+                player1, player2 = difficulty_screen.update_computer_difficulties()
             except exceptions.PlayerQuitException:
                 return self.quit()
 
         # Set player order
-        order_screen = screens.OrderScreen(
-            screens.CursesWindow(stdscr), player1, player2
-        )
+        order_screen = screens.OrderScreen(window, player1, player2)
         order_screen.draw()
         try:
             player1, player2 = order_screen.reorder_players()
         except exceptions.PlayerQuitException:
             return self.quit()
-        logger.info(f"{player1} is going first")
-
-        # Play the game until it's over or a player quits
-        board = Board(tokens=[player1.token, player2.token])
-        play_screen = screens.PlayScreen(
-            screens.CursesWindow(stdscr), board, player1, player2
+        events.log("order", f"{player1} is going first", first=str(player1))
+
+        # Play rounds until the player stops or quits
+        self.session = Session(
+            window,
+            player1,
+            player2,
+            self.record_writer,
+            self.move_delay,
+            self.latencies,
         )
         try:
-            play_screen.play()
+            self.session.run()
         except exceptions.PlayerQuitException:
             return self.quit()
+        events.log("end", "Game over", rounds=self.session.rounds)
+
+    def quit(self):
+        events.log("quit", "Player quit the game")
+
 
-        # Ask the player if they want to play again
-        end_screen = screens.EndScreen(
-            screens.CursesWindow(stdscr), board, board_window=play_screen.board_window
+class Session:
+    """Rounds of games between the same players on the same screens."""
+
+    def __init__(
+        self,
+        window,
+        player1,
+        player2,
+        record_writer=None,
+        move_delay=None,
+        latencies=None,
+    ):
+        """Set up the board and screens that are reused for every round.
+
+        Args:
+            window: A CursesWindow.
+            player1: The player who moves first.
+            player2: The player who moves second.
+            record_writer: A records.RecordWriter for finished games. Optional.
+            move_delay: Seconds to pause on each move. Optional.
+            latencies: An instrument.Recorder to summarize after each round.
+                Optional.
+        """
+        self.player1, self.player2 = player1, player2
+        self.record_writer = record_writer
+        self.latencies = latencies
+        self.board = Board(tokens=[player1.token, player2.token])
+        self.play_screen = screens.PlayScreen(
+            window, self.board, player1, player2, move_delay=move_delay
+        )
+        self.end_screen = screens.EndScreen(
+            window, self.board, board_window=self.play_screen.board_window
         )
-        play_again = end_screen.ask_play_again()
-        if play_again:
-            self(stdscr)  # ???
+        self.wins = {player1: 0, player2: 0}
+        self.draws = 0
+
+    @property
+    def rounds(self):
+        return self.wins[self.player1] + self.wins[self.player2] + self.draws
+
+    def totals(self, player):
+        """Return the (wins, draws, losses) of a player."""
+        opponent = self.player2 if player is self.player1 else self.player1
+        return self.wins[player], self.draws, self.wins[opponent]
+
+    def format_totals(self):
+        return (
+            f"{self.player1} {self.wins[self.player1]}, "
+            f"{self.player2} {self.wins[self.player2]}, "
+            f"ties {self.draws}"
+        )
+
+    def format_latencies(self):
+        """Return a table of computer move latencies so far, or None."""
+        if self.latencies is None:
+            return None
+        snapshot = self.latencies.snapshot()
+        if not snapshot:
+            return None
+        return instrument.format_text(snapshot, turns=False)
+
+    def play_round(self):
+        """Play one game on a cleared board and return the winner, or None."""
+        self.board.reset()
+        winner = self.play_screen.play()
+        if winner is None:
+            self.draws += 1
         else:
-            logger.info("Game over")
+            self.wins[winner] += 1
 
-    def quit(self):
-        logger.info("Player quit the game")
+        if self.record_writer is not None:
+            self.record_writer.write(self.player1, self.player2, self.board.moves)
+        events.flush()
+        return winner
+
+    def run(self):
+        """Play rounds until the player doesn't want to play again."""
+        while True:
+            self.play_round()
+            totals, details = self.format_totals(), self.format_latencies()
+            if not self.end_screen.ask_play_again(totals, details):
+                break
 
 
 def enable_logging(log_file):
-    """Configure the module logger to write to a file."""
-    handler = logging.FileHandler(log_file, mode="w")
-    handler.setLevel(logging.INFO)
-    logger.addHandler(handler)
-    logger.setLevel(logging.INFO)
+    """Log game events to a JSON Lines file."""
+    events.enable(log_file)
 
 
 def create_players_from_game_type(game_type):
@@ -125,7 +220,7 @@ def create_players_from_game_type(game_type):
             players.Computer("Computer 2"),
         )
     else:
-        raise TicTacToeError(f"unknown game type '{game_type}'")
+        raise exceptions.TicTacToeError(f"unknown game type '{game_type}'")
 
     return player1, player2
 
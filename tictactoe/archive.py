@@ -0,0 +1,232 @@
+"""An indexed archive of recorded games with random access.
+
+An archive is a record file (see tictactoe.records) plus a sidecar index
+file at the same path with ".idx" appended. The index holds the byte
+offset of every game, so game N is read without scanning the games
+before it. Games are grouped into fixed-size blocks, and the index also
+has a summary of each block: which tokens won, which tokens moved first
+and which pairs of difficulties played. Filtered iteration skips every
+block whose summary rules out a match.
+
+Both files are memory-mapped when an archive is opened for reading.
+
+Example:
+    >>> with ArchiveWriter("games.rec") as writer:
+    ...     for result in engine.play_many(player1, player2, 100000):
+    ...         writer.write(player1, player2, result.moves)
+    >>> with Archive("games.rec") as archive:
+    ...     archive[12345].moves
+    ...     ties = list(archive.filter(winner=TIE, difficulties=("Easy", "Hard")))
+"""
+import mmap
+import struct
+from collections import namedtuple
+
+from tictactoe import records
+
+
+MAGIC = b"TTTI"
+VERSION = 1
+
+# magic, version, block size, number of games, number of blocks, block table offset
+INDEX_HEADER = struct.Struct("<4sBIQQQ")
+OFFSET = struct.Struct("<Q")
+# data offset, first game, number of games, winners, first players, difficulty pairs
+BLOCK = struct.Struct("<QQIII32s")
+
+TIE = "tie"  # winner of a game that ended in a tie
+_TIE_BIT = 26  # bits 0-25 of token masks are the letters A-Z
+
+# A BlockSummary describes the games in one block of an archive
+BlockSummary = namedtuple(
+    "BlockSummary", ["offset", "first_game", "n_games", "winners", "firsts", "pairs"]
+)
+
+
+class ArchiveError(records.RecordFormatError):
+    pass
+
+
+def index_path(path):
+    return path + ".idx"
+
+
+def find_winner(record):
+    """Return the token of the winner of a recorded game, or TIE."""
+    board = records.replay(record)
+    if board.is_over():
+        return board.moves[-1].token
+    return TIE
+
+
+def _token_bit(token):
+    if token == TIE:
+        return 1 << _TIE_BIT
+    return 1 << (ord(token) - ord("A"))
+
+
+def _pair_bit(difficulties):
+    d1, d2 = (records.difficulties.index(d) for d in difficulties)
+    return 1 << (d1 * 16 + d2)
+
+
+class ArchiveWriter:
+    """Write games to a new archive and its index."""
+
+    def __init__(self, path, block_size=4096):
+        self.path = path
+        self.block_size = block_size
+        self.data = open(path, "wb")
+        self.data.write(records.FILE_HEADER.pack(records.MAGIC, records.VERSION))
+        self.index = open(index_path(path), "wb")
+        self.index.write(bytes(INDEX_HEADER.size))  # filled in on close
+        self.n_games = 0
+        self.blocks = []
+        self._block = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def write(self, player1, player2, moves):
+        """Add a finished game where player1 moved first."""
+        self.write_record(records.make_record(player1, player2, moves))
+
+    def write_record(self, record):
+        offset = self.data.tell()
+        if self.n_games % self.block_size == 0:
+            self._block = [offset, self.n_games, 0, 0, 0, 0]
+            self.blocks.append(self._block)
+
+        self.data.write(records.encode(record))
+        self.index.write(OFFSET.pack(offset))
+
+        block = self._block
+        block[2] += 1
+        block[3] |= _token_bit(find_winner(record))
+        block[4] |= _token_bit(record.tokens[0])
+        block[5] |= _pair_bit(record.difficulties)
+        self.n_games += 1
+
+    def close(self):
+        """Write the block table and header of the index and close both files."""
+        if self.data.closed:
+            return
+        table_offset = self.index.tell()
+        for offset, first_game, n_games, winners, firsts, pairs in self.blocks:
+            pairs = pairs.to_bytes(32, "little")
+            self.index.write(
+                BLOCK.pack(offset, first_game, n_games, winners, firsts, pairs)
+            )
+        self.index.seek(0)
+        self.index.write(
+            INDEX_HEADER.pack(
+                MAGIC,
+                VERSION,
+                self.block_size,
+                self.n_games,
+                len(self.blocks),
+                table_offset,
+            )
+        )
+        self.index.close()
+        self.data.close()
+
+
+class Archive:
+    """Read games from an archive through memory maps of its files."""
+
+    def __init__(self, path):
+        self.path = path
+        self.data = _map(path)
+        self.index = _map(index_path(path))
+
+        header = INDEX_HEADER.unpack_from(self.index, 0)
+        magic, version, self.block_size, self.n_games, self.n_blocks, table = header
+        if magic != MAGIC or version != VERSION:
+            raise ArchiveError(f"{index_path(path)} is not a version {VERSION} index")
+        self._table_offset = table
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return self.n_games
+
+    def __getitem__(self, n):
+        """Return game n as a GameRecord."""
+        if not 0 <= n < self.n_games:
+            raise IndexError(f"game {n} is not in the archive")
+        offset = OFFSET.unpack_from(self.index, INDEX_HEADER.size + OFFSET.size * n)[0]
+        record, _ = records.decode_from(self.data, offset)
+        return record
+
+    def board(self, n):
+        """Return a Board with the moves of game n played on it."""
+        return records.replay(self[n])
+
+    def sample(self, k, prng):
+        """Return k games drawn at random without replacement.
+
+        Args:
+            k: Number of games to sample.
+            prng: A random.Random instance.
+        """
+        return [self[n] for n in prng.sample(range(self.n_games), k)]
+
+    def blocks(self):
+        """Yield the BlockSummary of every block."""
+        for i in range(self.n_blocks):
+            offset, first_game, n_games, winners, firsts, pairs = BLOCK.unpack_from(
+                self.index, self._table_offset + BLOCK.size * i
+            )
+            pairs = int.from_bytes(pairs, "little")
+            yield BlockSummary(offset, first_game, n_games, winners, firsts, pairs)
+
+    def filter(self, winner=None, first_player=None, difficulties=None):
+        """Yield (n, record) for every game that matches all of the filters.
+
+        Args:
+            winner: Token of the winning player, or TIE. Optional.
+            first_player: Token of the player who moved first. Optional.
+            difficulties: Pair of difficulties of the first and second
+                players, where humans have difficulty None. Optional.
+        """
+        winner_bit = _token_bit(winner) if winner is not None else None
+        first_bit = _token_bit(first_player) if first_player is not None else None
+        pair_bit = _pair_bit(difficulties) if difficulties is not None else None
+
+        for block in self.blocks():
+            if winner_bit is not None and not block.winners & winner_bit:
+                continue
+            if first_bit is not None and not block.firsts & first_bit:
+                continue
+            if pair_bit is not None and not block.pairs & pair_bit:
+                continue
+
+            offset = block.offset
+            for n in range(block.first_game, block.first_game + block.n_games):
+                record, offset = records.decode_from(self.data, offset)
+                if first_player is not None and record.tokens[0] != first_player:
+                    continue
+                if difficulties is not None and record.difficulties != tuple(
+                    difficulties
+                ):
+                    continue
+                if winner is not None and find_winner(record) != winner:
+                    continue
+                yield n, record
+
+    def close(self):
+        self.data.close()
+        self.index.close()
+
+
+def _map(path):
+    with open(path, "rb") as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
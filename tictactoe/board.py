@@ -7,28 +7,52 @@ from tictactoe import exceptions, patterns
 # A Move is a space occupied by a token
 Move = namedtuple("Move", ["space", "token"])
 
+# Directions to look for lines through a space: across, down and diagonals
+DIRECTIONS = [(0, 1), (1, 0), (1, 1), (1, -1)]
 
-class Board:
-    def __init__(self, tokens=None):
-        """Initialize a board as a list of spaces and save player tokens."""
-        # fmt: off
-        self.b = [
-            "0", "1", "2",
-            "3", "4", "5",
-            "6", "7", "8",
-        ]
-        # fmt: on
+
+class MNKBoard:
+    def __init__(self, rows=3, cols=3, k=3, tokens=None):
+        """Initialize an empty rows x cols board where k in a row wins.
+
+        Spaces are numbered row by row from 0. The spaces taken by each
+        player are stored as bit masks, where bit i is set if the player has
+        a token in space i. The spaces that are still open are kept in a free
+        mask.
+        """
+        self.rows, self.cols, self.k = rows, cols, k
+        self.size = rows * cols
+        self.grid = patterns.make_grid(rows, cols, k)
         self.tokens = tokens or ["X", "O"]
+        self.masks = [0, 0]  # spaces taken by each token
+        self.free = (1 << self.size) - 1  # spaces without a token
         self.moves = []  # record of moves
+        self.won = False  # whether either token has a winning pattern
+        self.winning_line = None  # spaces of the winning pattern
+        self.hash = 0  # Zobrist hash of the tokens on the board
+        self._won_at = None  # number of moves when the game was won
+
+    def reset(self):
+        """Take every token off the board to start a new game."""
+        self.masks = [0, 0]
+        self.free = (1 << self.size) - 1
+        self.moves = []
+        self.won, self.winning_line, self.hash, self._won_at = False, None, 0, None
+
+    @property
+    def b(self):
+        """The board as a list of spaces, with open spaces labeled by index."""
+        return [self._token_at(s) for s in range(self.size)]
 
     def __getitem__(self, key):
         """Return the token on the board by its index."""
         try:
-            token = self.b[int(key)]
-        except (ValueError, IndexError) as err:
+            space = int(key)
+        except ValueError as err:
             raise exceptions.KeyNotOnBoardError(err)
-        else:
-            return token
+        if not 0 <= space < self.size:
+            raise exceptions.KeyNotOnBoardError(f"space {space} is not on the board")
+        return self._token_at(space)
 
     def __setitem__(self, key, token):
         """Place a token on the board.
@@ -40,29 +64,171 @@ class Board:
             raise exceptions.SpotAlreadySelectedError()
         elif prev in self.tokens:
             raise exceptions.SpotTakenByOpponentError()
+        elif token not in self.tokens:
+            raise exceptions.ImproperTokenError(f"token '{token}' is not on this board")
         else:
-            self.b[int(key)] = token
-            self.moves.append(Move(key, token))
+            self.push(int(key), token)
+
+    def push(self, space, token):
+        """Place a token on an open space without checking the move.
+
+        Use push and pop to search a single board in place. Moves from users
+        should be placed with board[key] = token, which validates them.
+
+        >>> board.push(4, "X")
+        >>> board.pop()
+        Move(space=4, token='X')
+        """
+        i = self.tokens.index(token)
+        mask = self.masks[i] | 1 << space
+        self.masks[i] = mask
+        self.free &= ~(1 << space)
+        self.moves.append(Move(space, token))
+        self.hash ^= self.grid.zobrist_keys[i][space]
+        if not self.won:
+            # Only the player who moved can have completed a line
+            line = self._find_line(mask, space)
+            if line is not None:
+                self._set_won(line)
+
+    def pop(self):
+        """Take back the last move and return it."""
+        move = self.moves.pop()
+        i = self.tokens.index(move.token)
+        bit = 1 << move.space
+        self.masks[i] &= ~bit
+        self.free |= bit
+        self.hash ^= self.grid.zobrist_keys[i][move.space]
+        if self.won and len(self.moves) < self._won_at:
+            self.won, self.winning_line, self._won_at = False, None, None
+        return move
+
+    def _set_won(self, line):
+        self.won, self.winning_line, self._won_at = True, line, len(self.moves)
+
+    def _find_line(self, mask, space):
+        """Return a line completed by the last move to space, or None."""
+        # Only lines through the last move can have been completed
+        return self.find_line_through(mask, space)
+
+    def find_line_through(self, mask, space):
+        """Return k spaces in a row in a mask that pass through a space, or None.
+
+        Only the four directions through the space are scanned, so this takes
+        O(k) steps however large the board is.
+        """
+        rows, cols, k = self.rows, self.cols, self.k
+        r, c = divmod(space, cols)
+        for dr, dc in DIRECTIONS:
+            line = [space]
+            for step in (1, -1):
+                rr, cc = r + step * dr, c + step * dc
+                while (
+                    len(line) < k
+                    and 0 <= rr < rows
+                    and 0 <= cc < cols
+                    and mask >> (rr * cols + cc) & 1
+                ):
+                    line.append(rr * cols + cc)
+                    rr, cc = rr + step * dr, cc + step * dc
+            if len(line) == k:
+                return tuple(sorted(line))
+        return None
+
+    def _token_at(self, space):
+        bit = 1 << space
+        if self.masks[0] & bit:
+            return self.tokens[0]
+        elif self.masks[1] & bit:
+            return self.tokens[1]
+        else:
+            return str(space)
+
+    def mask(self, token):
+        """Return the mask of spaces taken by a token."""
+        return self.masks[self.tokens.index(token)]
+
+    def completing_spaces(self, token):
+        """Return the mask of open spaces that would complete a line for a token."""
+        mask = self.mask(token)
+        spaces = 0
+        for line in self.grid.line_masks:
+            missing = line & ~mask
+            if missing & self.free and not missing & (missing - 1):
+                spaces |= missing
+        return spaces
+
+    def code(self):
+        """Return the base-3 code of the board.
+
+        Each space is a base-3 digit: 0 if the space is open, 1 if it holds
+        the first token and 2 if it holds the second token.
+        """
+        return self._code(range(self.size))
+
+    def _code(self, perm):
+        first, second = self.masks
+        code = 0
+        for s in range(self.size):
+            code += (first >> s & 1 | (second >> s & 1) << 1) * 3 ** perm[s]
+        return code
+
+    def canonical_key(self):
+        """Return the smallest code of the board over its rotations and reflections.
+
+        Boards that are symmetric to each other share a canonical key.
+        """
+        return min(self._code(perm) for perm in self.grid.symmetries)
 
     def find_winning_pattern(self):
-        for s1, s2, s3 in patterns.winning_patterns:
-            if self.b[s1] == self.b[s2] == self.b[s3]:
-                return s1, s2, s3
-        return -1, -1, -1
+        return self.winning_line or (-1,) * self.k
 
     def is_over(self):
-        return any(
-            self[s1] == self[s2] == self[s3] for s1, s2, s3 in patterns.winning_patterns
-        )
+        return self.won
 
     def is_tie(self):
-        return all(token in self.tokens for token in self.b)
+        return not self.free
+
+    def available(self):
+        spaces = []
+        free = self.free
+        while free:
+            bit = free & -free
+            spaces.append(bit.bit_length() - 1)
+            free ^= bit
+        return spaces
+
+
+class Board(MNKBoard):
+    """The 3x3 tic tac toe board, using the lookup tables in patterns."""
+
+    def __init__(self, tokens=None):
+        super().__init__(3, 3, 3, tokens=tokens)
+
+    def _find_line(self, mask, space):
+        return patterns.winning_lines[mask]
+
+    def completing_spaces(self, token):
+        return patterns.completing_masks[self.mask(token)] & self.free
+
+    def code(self):
+        return patterns.ternary[self.masks[0]] + 2 * patterns.ternary[self.masks[1]]
+
+    def canonical_key(self):
+        return patterns.canonical_code(self.masks[0], self.masks[1])
+
+    def find_winning_pattern(self):
+        pattern = (
+            patterns.winning_lines[self.masks[0]]
+            or patterns.winning_lines[self.masks[1]]
+        )
+        return pattern or (-1, -1, -1)
 
     def available(self):
-        return [int(token) for token in self.b if token not in self.tokens]
+        return list(patterns.mask_spaces[self.free])
 
     def available_corners(self):
-        return [s for s in patterns.corners if self.b[s] not in self.tokens]
+        return list(patterns.mask_spaces[self.free & patterns.corner_mask])
 
     def available_middles(self):
-        return [s for s in patterns.middles if self.b[s] not in self.tokens]
+        return list(patterns.mask_spaces[self.free & patterns.middle_mask])
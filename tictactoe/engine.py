@@ -0,0 +1,59 @@
+"""Play games between computer players without a user interface."""
+from collections import namedtuple
+
+from tictactoe.board import Board
+
+
+# A Result is the outcome of a finished game
+Result = namedtuple("Result", ["winner", "moves", "pattern"])
+
+
+def play(player1, player2, board=None, writer=None):
+    """Play a complete game between two computer players.
+
+    Players take turns starting with player1, unless the board already has
+    moves on it, in which case play resumes with whoever is next. Players
+    without tokens are given "X" and "O".
+
+    Args:
+        player1: The Computer that moves first.
+        player2: The Computer that moves second.
+        board: A Board to play on. If None, a new Board is used.
+        writer: A records.RecordWriter to record the game with. Optional.
+
+    Returns:
+        A Result with the winning player (None for a tie), the list of
+        Moves in the order they were played, and the winning pattern
+        (None for a tie).
+
+    Example:
+        >>> result = play(EasyComputer(seed=1), HardComputer(seed=2))
+        >>> result.winner
+    """
+    if player1.token is None:
+        player1.token = "X"
+    if player2.token is None:
+        player2.token = "O"
+    if board is None:
+        board = Board(tokens=[player1.token, player2.token])
+
+    order = (player1, player2)
+    turn = len(board.moves)
+    while not board.is_over() and not board.is_tie():
+        player = order[turn % 2]
+        board[player.move(board)] = player.token
+        turn += 1
+
+    if writer is not None:
+        writer.write(player1, player2, board.moves)
+
+    if board.is_over():
+        winner = order[(turn - 1) % 2]
+        return Result(winner, board.moves, board.find_winning_pattern())
+    return Result(None, board.moves, None)
+
+
+def play_many(player1, player2, n_games, writer=None):
+    """Play a number of games between two players and yield each Result."""
+    for _ in range(n_games):
+        yield play(player1, player2, writer=writer)
@@ -0,0 +1,133 @@
+"""Structured logging of game events.
+
+Every event is a record on the "game" logger with a name, a message and
+typed fields:
+
+    >>> events.log("move", f"{player} placed a token on 4", player="X", space=4)
+
+Logging is off until enable() is called with a file name. Then the thread
+that logs an event only puts the record on a queue. A listener thread
+formats the records as JSON Lines and writes them to the file in
+batches. Use flush() to wait until every event logged so far is in the
+file.
+"""
+import atexit
+import json
+import logging
+import logging.handlers
+import queue
+
+
+logger = logging.getLogger("game")
+
+_event_log = None  # the EventLog that is enabled, if any
+
+
+def log(event, message, **fields):
+    """Log an event with a message and typed fields."""
+    logger.info(message, extra={"event": event, "fields": fields})
+
+
+class JSONLinesFormatter(logging.Formatter):
+    def format(self, record):
+        """Format an event as a JSON object on one line."""
+        obj = {"time": record.created, "event": getattr(record, "event", None)}
+        obj.update(getattr(record, "fields", {}))
+        obj["message"] = record.getMessage()
+        return json.dumps(obj, default=str)
+
+
+class BufferedFileHandler(logging.Handler):
+    """Write formatted records to a file, many records per write."""
+
+    def __init__(self, filename, capacity=256):
+        super().__init__()
+        self.stream = open(filename, "w", encoding="utf-8")
+        self.capacity = capacity
+        self.lines = []
+
+    def emit(self, record):
+        self.lines.append(self.format(record))
+        if len(self.lines) >= self.capacity:
+            self.flush()
+
+    def flush(self):
+        with self.lock:
+            if self.lines:
+                self.stream.write("\n".join(self.lines) + "\n")
+                self.lines.clear()
+            self.stream.flush()
+
+    def close(self):
+        with self.lock:
+            if not self.stream.closed:
+                self.flush()
+                self.stream.close()
+        super().close()
+
+
+class EventQueueHandler(logging.handlers.QueueHandler):
+    def prepare(self, record):
+        """Queue records as they are, leaving all formatting to the listener.
+
+        Events are logged without args or exception info, so their records
+        are safe to pass to another thread unchanged.
+        """
+        return record
+
+
+class EventLog:
+    """Send the events of the game logger to a file through a queue."""
+
+    def __init__(self, filename, capacity=256):
+        """
+        Args:
+            filename: Name of the JSON Lines file to write. It is replaced if
+                it exists.
+            capacity: Number of events to write at a time.
+        """
+        self.queue = queue.Queue()
+        self.handler = BufferedFileHandler(filename, capacity)
+        self.handler.setFormatter(JSONLinesFormatter())
+        self.queue_handler = EventQueueHandler(self.queue)
+        self.listener = logging.handlers.QueueListener(self.queue, self.handler)
+
+    def start(self):
+        logger.addHandler(self.queue_handler)
+        logger.setLevel(logging.INFO)
+        self.listener.start()
+
+    def flush(self):
+        """Wait for the listener to take every queued event, then write them."""
+        self.queue.join()
+        self.handler.flush()
+
+    def close(self):
+        logger.removeHandler(self.queue_handler)
+        self.listener.stop()
+        self.handler.close()
+
+
+def enable(filename, capacity=256):
+    """Log events to a file, replacing the file that was enabled before."""
+    global _event_log
+    if _event_log is None:
+        atexit.register(disable)
+    else:
+        _event_log.close()
+    _event_log = EventLog(filename, capacity)
+    _event_log.start()
+    return _event_log
+
+
+def disable():
+    global _event_log
+    if _event_log is not None:
+        _event_log.close()
+        _event_log = None
+
+
+def flush():
+    """Write every event logged so far, if logging is enabled."""
+    if _event_log is not None:
+        _event_log.flush()
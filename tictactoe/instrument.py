@@ -0,0 +1,237 @@
+"""Measure how long computer players take to decide their moves.
+
+Instrumentation is off by default and costs nothing until it is enabled.
+enable() wraps the move and helper methods of Computer and every
+subclass defined so far. Each call is timed, and counted in a histogram
+for the player class, the method and the turn, which is the number of
+moves on the board.
+
+    >>> with instrument.recording() as recorder:
+    ...     engine.play(players.HardComputer(), players.EasyComputer())
+    >>> print(instrument.format_text(recorder.snapshot()))
+
+Histogram bucket b counts the calls that took from 2 ** (b - 1) up to
+2 ** b nanoseconds, so percentiles are known to within a factor of 2.
+"""
+import contextlib
+import functools
+import json
+import time
+from collections import namedtuple
+
+from tictactoe import players
+
+
+METHODS = [
+    "move",
+    "find_winning_move",
+    "find_blocking_move",
+    "find_adjacent_corner",
+    "find_opposite_corner",
+]
+N_BUCKETS = 48  # calls longer than 2 ** 47 ns (39 hours) go in the last bucket
+
+# Stats are the timings of the calls of one method in one turn
+Stats = namedtuple("Stats", ["count", "total_ns", "max_ns", "buckets"])
+
+_recorder = None  # the Recorder that timed calls are added to while enabled
+_patched = []  # (class, method name, original function) of wrapped methods
+_active = set()  # (player id, method name) of calls being timed
+
+
+class Recorder:
+    """Latency histograms by (player class, method, turn)."""
+
+    def __init__(self):
+        self.stats = {}  # [count, total_ns, max_ns, buckets] by key
+
+    def add(self, key, ns):
+        stats = self.stats.get(key)
+        if stats is None:
+            stats = self.stats[key] = [0, 0, 0, [0] * N_BUCKETS]
+        stats[0] += 1
+        stats[1] += ns
+        if ns > stats[2]:
+            stats[2] = ns
+        stats[3][min(ns.bit_length(), N_BUCKETS - 1)] += 1
+
+    def merge(self, snapshot):
+        """Add the stats of a snapshot, e.g. from another process."""
+        for key, other in snapshot.items():
+            stats = self.stats.get(key)
+            if stats is None:
+                stats = self.stats[key] = [0, 0, 0, [0] * N_BUCKETS]
+            stats[0] += other.count
+            stats[1] += other.total_ns
+            stats[2] = max(stats[2], other.max_ns)
+            stats[3] = [a + b for a, b in zip(stats[3], other.buckets)]
+
+    def snapshot(self):
+        """Return a copy of the stats as a dict of Stats by key."""
+        return {
+            key: Stats(count, total_ns, max_ns, tuple(buckets))
+            for key, (count, total_ns, max_ns, buckets) in self.stats.items()
+        }
+
+    def reset(self):
+        self.stats.clear()
+
+
+def _timed(method, name):
+    @functools.wraps(method)
+    def timed(self, board, *args, **kwargs):
+        recorder = _recorder
+        call = (id(self), name)
+        if recorder is None or call in _active:
+            # calls to super() are part of the call being timed
+            return method(self, board, *args, **kwargs)
+        _active.add(call)
+        start = time.perf_counter_ns()
+        try:
+            return method(self, board, *args, **kwargs)
+        finally:
+            elapsed = time.perf_counter_ns() - start
+            _active.discard(call)
+            recorder.add((type(self).__name__, name, len(board.moves)), elapsed)
+
+    return timed
+
+
+def _computer_classes(cls=players.Computer):
+    yield cls
+    for subclass in cls.__subclasses__():
+        yield from _computer_classes(subclass)
+
+
+def enable(recorder=None):
+    """Start timing computer players, adding the timings to a recorder.
+
+    Args:
+        recorder: A Recorder. If None, a new Recorder is used.
+
+    Returns:
+        The Recorder.
+    """
+    global _recorder
+    if not _patched:
+        for cls in set(_computer_classes()):
+            for name in METHODS:
+                if name in vars(cls):
+                    method = vars(cls)[name]
+                    _patched.append((cls, name, method))
+                    setattr(cls, name, _timed(method, name))
+    _recorder = recorder or Recorder()
+    return _recorder
+
+
+def disable():
+    """Stop timing and put the original methods back."""
+    global _recorder
+    _recorder = None
+    while _patched:
+        cls, name, method = _patched.pop()
+        setattr(cls, name, method)
+
+
+def is_enabled():
+    return _recorder is not None
+
+
+@contextlib.contextmanager
+def recording():
+    """Time computer players in a new Recorder until the block ends.
+
+    Timing goes back to the recorder that was enabled before, if any.
+    """
+    global _recorder
+    previous = _recorder
+    recorder = enable(Recorder())
+    try:
+        yield recorder
+    finally:
+        if previous is None:
+            disable()
+        else:
+            _recorder = previous
+
+
+def combine(stats):
+    """Add up a list of Stats, e.g. for every turn of a method."""
+    return Stats(
+        sum(s.count for s in stats),
+        sum(s.total_ns for s in stats),
+        max(s.max_ns for s in stats),
+        tuple(map(sum, zip(*(s.buckets for s in stats)))),
+    )
+
+
+def by_method(snapshot):
+    """Combine the stats of all turns, keyed by (player class, method)."""
+    groups = {}
+    for (player, method, _), stats in snapshot.items():
+        groups.setdefault((player, method), []).append(stats)
+    return {key: combine(stats) for key, stats in groups.items()}
+
+
+def percentile(stats, q):
+    """Return an upper bound in ns of the q-th percentile of the calls."""
+    rank = q / 100 * stats.count
+    seen = 0
+    for bucket, n in enumerate(stats.buckets):
+        seen += n
+        if n and seen >= rank:
+            return 1 << bucket if bucket else 0
+    return stats.max_ns
+
+
+def format_text(snapshot, turns=True):
+    """Format a snapshot as a table with times in microseconds.
+
+    Args:
+        snapshot: A dict of Stats from Recorder.snapshot().
+        turns: Whether to show each turn, or combine the turns of a method.
+    """
+    if not turns:
+        snapshot = {
+            (player, method, "all"): stats
+            for (player, method), stats in by_method(snapshot).items()
+        }
+    rows = [["player", "method", "turn", "calls", "mean", "p50", "p99", "max"]]
+    for key in sorted(snapshot, key=lambda key: tuple(map(str, key))):
+        stats = snapshot[key]
+        times = [
+            stats.total_ns / stats.count,
+            percentile(stats, 50),
+            percentile(stats, 99),
+            stats.max_ns,
+        ]
+        rows.append(
+            [*map(str, key), str(stats.count)] + [f"{t / 1000:.1f}" for t in times]
+        )
+
+    widths = [max(len(cell) for cell in column) for column in zip(*rows)]
+    lines = []
+    for row in rows:
+        # names are aligned left and numbers right
+        cells = [cell.ljust(w) for cell, w in zip(row[:2], widths)]
+        cells += [cell.rjust(w) for cell, w in zip(row[2:], widths[2:])]
+        lines.append("  ".join(cells))
+    return "\n".join(lines)
+
+
+def to_json(snapshot):
+    """Format a snapshot as a JSON list with one object per key."""
+    return json.dumps(
+        [
+            {
+                "player": player,
+                "method": method,
+                "turn": turn,
+                "count": stats.count,
+                "total_ns": stats.total_ns,
+                "max_ns": stats.max_ns,
+                "buckets": {str(b): n for b, n in enumerate(stats.buckets) if n},
+            }
+            for (player, method, turn), stats in sorted(snapshot.items())
+        ]
+    )
@@ -1,4 +1,9 @@
 """Patterns of winning spaces."""
+import functools
+import itertools
+import random
+from collections import namedtuple
+
 winning_patterns = [
     (0, 1, 2),
     (3, 4, 5),
@@ -43,3 +48,176 @@ def make_diagonal_patterns(winning_patterns, corners):
 partial_patterns = make_partial_patterns(winning_patterns)
 outer_patterns = make_outer_patterns(winning_patterns)
 diagonal_patterns = make_diagonal_patterns(winning_patterns, corners)
+
+
+def make_mask(spaces):
+    """Create a 9-bit mask with a bit set for each space.
+
+    >>> make_mask((0, 1, 2)) == 0b000000111
+    """
+    mask = 0
+    for s in spaces:
+        mask |= 1 << s
+    return mask
+
+
+def make_mask_spaces():
+    """Create a table of the spaces set in every possible 9-bit mask."""
+    return [tuple(s for s in range(9) if mask >> s & 1) for mask in range(512)]
+
+
+full_mask = make_mask(range(9))
+corner_mask = make_mask(corners)
+middle_mask = make_mask(middles)
+winning_masks = [make_mask(pattern) for pattern in winning_patterns]
+mask_spaces = make_mask_spaces()
+
+
+def make_winning_lines(winning_patterns):
+    """Create a table of the first winning pattern in every 9-bit mask.
+
+    Masks that don't contain a winning pattern map to None.
+
+    >>> winning_lines[0b000000111] == (0, 1, 2)
+    """
+    winning_lines = [None] * 512
+    for mask in range(512):
+        for pattern in winning_patterns:
+            line = make_mask(pattern)
+            if mask & line == line:
+                winning_lines[mask] = pattern
+                break
+    return winning_lines
+
+
+def make_completing_masks(winning_patterns):
+    """Create a table of the spaces that complete a pattern for every 9-bit mask.
+
+    A space completes a pattern if the mask already holds the other two
+    spaces of a winning pattern. Mask the result with the free spaces on a
+    board to get the winning moves that are actually open.
+
+    >>> completing_masks[0b000000011] == 0b000000100
+    """
+    completing_masks = [0] * 512
+    for mask in range(512):
+        for pattern in winning_patterns:
+            missing = make_mask(pattern) & ~mask
+            if missing and not missing & (missing - 1):  # exactly one space missing
+                completing_masks[mask] |= missing
+    return completing_masks
+
+
+winning_lines = make_winning_lines(winning_patterns)
+win_table = [line is not None for line in winning_lines]
+completing_masks = make_completing_masks(winning_patterns)
+
+
+def make_symmetries(rows=3, cols=3):
+    """Create the rotations and reflections of a grid as permutations.
+
+    Each symmetry maps a space to the space it moves to, so the identity is
+    (0, 1, ..., rows * cols - 1). Square grids have 8 symmetries and other
+    grids have 4.
+    """
+    spaces = range(rows * cols)
+    reflect = [cols * (s // cols) + cols - 1 - s % cols for s in spaces]  # mirror
+    symmetries = []
+    perm = list(spaces)
+    if rows == cols:
+        rotate = [rows * (s % rows) + rows - 1 - s // rows for s in spaces]
+        for _ in range(4):
+            symmetries.append(tuple(perm))
+            symmetries.append(tuple(reflect[s] for s in perm))
+            perm = [rotate[s] for s in perm]
+    else:
+        flip = [cols * (rows - 1 - s // cols) + s % cols for s in spaces]
+        for _ in range(2):
+            symmetries.append(tuple(perm))
+            symmetries.append(tuple(reflect[s] for s in perm))
+            perm = [flip[s] for s in perm]
+    return symmetries
+
+
+def make_symmetric_masks(symmetries):
+    """Create a table of every 9-bit mask under each of the symmetries."""
+    return [
+        [make_mask(perm[s] for s in mask_spaces[mask]) for mask in range(512)]
+        for perm in symmetries
+    ]
+
+
+symmetries = make_symmetries()
+symmetric_masks = make_symmetric_masks(symmetries)
+
+
+def make_ternary_codes():
+    """Create a table of the base-3 code of the spaces set in every 9-bit mask.
+
+    The code of a board is ternary[first] + 2 * ternary[second], where first
+    and second are the masks of the first and second player to move.
+    """
+    return [sum(3 ** s for s in mask_spaces[mask]) for mask in range(512)]
+
+
+ternary = make_ternary_codes()
+
+
+def make_symmetric_ternary_codes(symmetric_masks, ternary):
+    """Create a table of the base-3 code of every 9-bit mask under each symmetry."""
+    return [[ternary[m] for m in masks] for masks in symmetric_masks]
+
+
+def make_zobrist_keys(n_spaces=9, seed=9):
+    """Create a random 64-bit key for each token in each space.
+
+    The keys are seeded so that hashes agree across processes.
+    """
+    prng = random.Random(seed)
+    return [[prng.getrandbits(64) for _ in range(n_spaces)] for _ in range(2)]
+
+
+def canonical_code(first, second):
+    """Return the smallest base-3 code of a position over all of its symmetries."""
+    return min(t[first] + 2 * t[second] for t in symmetric_ternary)
+
+
+symmetric_ternary = make_symmetric_ternary_codes(symmetric_masks, ternary)
+zobrist_keys = make_zobrist_keys()
+
+
+# A Grid holds the patterns of a rows x cols board where k in a row wins
+Grid = namedtuple(
+    "Grid", ["rows", "cols", "k", "lines", "line_masks", "symmetries", "zobrist_keys"]
+)
+
+
+def make_lines(rows, cols, k):
+    """Create every line of k spaces in a row on a grid.
+
+    Lines run across, down and along both diagonals, and list their spaces
+    in increasing order. On a 3x3 grid with k=3 these are the 8 winning
+    patterns.
+    """
+    lines = []
+    for r, c in itertools.product(range(rows), range(cols)):
+        for dr, dc in [(0, 1), (1, 0), (1, 1), (1, -1)]:
+            end_r, end_c = r + (k - 1) * dr, c + (k - 1) * dc
+            if 0 <= end_r < rows and 0 <= end_c < cols:
+                lines.append(tuple((r + i * dr) * cols + c + i * dc for i in range(k)))
+    return lines
+
+
+@functools.lru_cache(maxsize=None)
+def make_grid(rows, cols, k):
+    """Create the patterns of a grid, once per size of grid."""
+    lines = make_lines(rows, cols, k)
+    return Grid(
+        rows=rows,
+        cols=cols,
+        k=k,
+        lines=lines,
+        line_masks=[make_mask(line) for line in lines],
+        symmetries=make_symmetries(rows, cols),
+        zobrist_keys=make_zobrist_keys(rows * cols),
+    )
@@ -1,6 +1,50 @@
+import math
 import string
 import random
-from tictactoe import exceptions, patterns
+import time
+from collections import Counter, OrderedDict, defaultdict, namedtuple
+from tictactoe import exceptions, patterns, solver, tablebase
+
+
+# A CacheInfo is a snapshot of the counters of a DecisionCache
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "evictions", "size", "maxsize"])
+
+
+class DecisionCache:
+    """A bounded cache of candidate moves by position.
+
+    When the cache is full, the position used least recently is evicted.
+    """
+
+    def __init__(self, maxsize=4096):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.hits = self.misses = self.evictions = 0
+
+    def get(self, key):
+        """Return the candidates for a position, or None if they aren't cached."""
+        candidates = self.entries.get(key)
+        if candidates is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self.entries.move_to_end(key)
+        return candidates
+
+    def put(self, key, candidates):
+        self.entries[key] = candidates
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        self.entries.clear()
+        self.hits = self.misses = self.evictions = 0
+
+    def info(self):
+        return CacheInfo(
+            self.hits, self.misses, self.evictions, len(self.entries), self.maxsize
+        )
 
 
 class Player:
@@ -32,19 +76,74 @@ class Human(Player):
 
 class Computer(Player):
     label = "Computer"
+    cache = None  # DecisionCache shared by the players of a class, if enabled
 
     def __init__(self, label=None, seed=None):
         super().__init__(label=label)
+        self.seed = seed
         self.prng = random.Random(seed)
 
     def move(self, board):
         raise NotImplementedError()
 
+    def move_many(self, boards):
+        """Return a move for each of a sequence of boards.
+
+        The moves are the same as calling move on each board in order.
+        """
+        return [self.move(board) for board in boards]
+
+    @classmethod
+    def enable_cache(cls, maxsize=4096):
+        """Cache the candidate moves of all players of this class by position.
+
+        Subclasses share the cache, but each class keeps its own entries.
+        Only players that choose moves from candidates(board) use the cache.
+        """
+        cls.cache = DecisionCache(maxsize)
+        return cls.cache
+
+    @classmethod
+    def disable_cache(cls):
+        """Stop caching for this class, unless a base class has a cache."""
+        if cls is Computer:
+            cls.cache = None
+        elif "cache" in vars(cls):
+            del cls.cache
+
+    def candidates(self, board):
+        """Return a tuple of the moves to choose from at random."""
+        raise NotImplementedError()
+
+    def find_candidates(self, board):
+        """Return the candidates for a board, from the cache if it's enabled.
+
+        Positions are keyed by the class of this player, the spaces of this
+        player and the opponent, and the turn.
+        """
+        cache = self.cache
+        if cache is None:
+            return self.candidates(board)
+        player = board.mask(self.token)
+        opponent = (board.masks[0] | board.masks[1]) & ~player
+        key = (type(self), player, opponent, len(board.moves))
+        candidates = cache.get(key)
+        if candidates is None:
+            candidates = self.candidates(board)
+            cache.put(key, candidates)
+        return candidates
+
+    def choose(self, candidates):
+        """Pick one of the candidates, drawing from the prng if there's a choice."""
+        if len(candidates) == 1:
+            return candidates[0]
+        return self.prng.choice(candidates)
+
     def find_winning_move(self, board, token=None):
         token = token or self.token
-        for (s1, s2), s3 in patterns.partial_patterns.items():
-            if board[s1] == board[s2] == token and board[s3] not in board.tokens:
-                return s3
+        winning_moves = board.completing_spaces(token)
+        if winning_moves:
+            return (winning_moves & -winning_moves).bit_length() - 1  # lowest space
         return -1
 
     def find_blocking_move(self, board):
@@ -53,17 +152,19 @@ class Computer(Player):
 
     def find_adjacent_corner(self, board):
         for s1, s2, s3 in patterns.outer_patterns:
-            if board[s1] == self.token and board[s2] == str(s2):
+            if board[s2] != str(s2):
+                continue
+            if board[s1] == self.token and board[s3] == str(s3):
                 return s3
-            if board[s3] == self.token and board[s2] == str(s2):
+            if board[s3] == self.token and board[s1] == str(s1):
                 return s1
         return -1
 
     def find_opposite_corner(self, board):
         for s1, s2, s3 in patterns.diagonal_patterns:
-            if board[s1] == self.token:
+            if board[s1] == self.token and board[s3] == str(s3):
                 return s3
-            if board[s3] == self.token:
+            if board[s3] == self.token and board[s1] == str(s1):
                 return s1
         return -1
 
@@ -75,24 +176,57 @@ class EasyComputer(Computer):
         """Choose one of the available spaces at random."""
         return self.prng.choice(board.available())
 
+    def move_many(self, boards):
+        choice, mask_spaces = self.prng.choice, patterns.mask_spaces
+        return [
+            choice(mask_spaces[board.free] if board.size == 9 else board.available())
+            for board in boards
+        ]
+
 
 class MediumComputer(Computer):
     difficulty = "Medium"
 
     def move(self, board):
         """Win or block if able, otherwise pick center or at random."""
+        return self.choose(self.find_candidates(board))
+
+    def candidates(self, board):
         winning_move = self.find_winning_move(board)
         if winning_move != -1:
-            return winning_move
+            return (winning_move,)
 
         blocking_move = self.find_blocking_move(board)
         if blocking_move != -1:
-            return blocking_move
+            return (blocking_move,)
 
         if board[4] == "4":  # center square is open
-            return 4
+            return (4,)
         else:
-            return self.prng.choice(board.available())
+            return tuple(board.available())
+
+    def move_many(self, boards):
+        """Return a move for each board, looking up the candidates in tables."""
+        completing_masks, mask_spaces = patterns.completing_masks, patterns.mask_spaces
+        center = 1 << 4
+        moves = []
+        for board in boards:
+            if board.size != 9:
+                moves.append(self.move(board))  # the tables only cover 3x3 boards
+                continue
+            player = board.mask(self.token)
+            opponent = (board.masks[0] | board.masks[1]) & ~player
+            free = board.free
+            forced = (
+                completing_masks[player] & free
+                or completing_masks[opponent] & free
+                or center & free
+            )
+            if forced:
+                moves.append(mask_spaces[forced & -forced][0])  # lowest space
+            else:
+                moves.append(self.choose(mask_spaces[free]))
+        return moves
 
 
 class HardComputer(Computer):
@@ -100,52 +234,57 @@ class HardComputer(Computer):
 
     def move(self, board):
         """Optimally select positions on a board."""
+        return self.choose(self.find_candidates(board))
+
+    def candidates(self, board):
         # If you can win, win.
         winning_move = self.find_winning_move(board)
         if winning_move != -1:
-            return winning_move
+            return (winning_move,)
 
         # If you need to block, block.
         blocking_move = self.find_blocking_move(board)
         if blocking_move != -1:
-            return blocking_move
+            return (blocking_move,)
 
         turn = len(board.moves)
         if not turn % 2:
             # Implement the optimal first turn strategy
-            move = self._optimal_first_turn_strategy(board, turn)
+            moves = self._optimal_first_turn_strategy(board, turn)
         else:
             # Implement the best response strategy
-            move = self._optimal_response_strategy(board, turn)
+            moves = self._optimal_response_strategy(board, turn)
 
-        return move
+        return moves
 
     def _optimal_first_turn_strategy(self, board, turn):
         assert not turn % 2, f"turn {turn} is not a first turn strategy"
         if turn == 0:
             # select a corner at random
-            return self.prng.choice(board.available_corners())
+            return tuple(board.available_corners())
         elif turn == 2:
             if board[4] != "4":
                 # other player picked center, go opposite corner
-                return self.find_opposite_corner(board)
+                move = self.find_opposite_corner(board)
             else:
                 # pick adjacent corner
-                return self.find_adjacent_corner(board)
-        elif turn == 4:
+                move = self.find_adjacent_corner(board)
+            if move != -1:
+                return (move,)
+        elif turn == 4 and board[4] == "4":
             # was blocked and player did not take middle
-            return 4
-        else:
-            # game is a tie
-            return self.prng.choice(board.available())
+            return (4,)
+
+        # game is a tie
+        return tuple(board.available())
 
     def _optimal_response_strategy(self, board, turn):
         assert turn % 2, f"turn {turn} is not a response strategy"
         if turn == 1:
             if board[4] == "4":  # take the center if it's open
-                return 4
+                return (4,)
             else:
-                return self.prng.choice(board.available_corners())
+                return tuple(board.available_corners())
         elif turn == 3:
             opponent_move_1, opponent_move_2 = (
                 board.moves[0].space,
@@ -155,6 +294,366 @@ class HardComputer(Computer):
                 opponent_move_1 in patterns.corners
                 and opponent_move_2 in patterns.corners
             ):
-                return self.prng.choice(board.available_middles())
+                return tuple(board.available_middles())
 
-        return self.prng.choice(board.available())
+        return tuple(board.available())
+
+
+class SolverComputer(Computer):
+    difficulty = "Perfect"
+
+    def move(self, board):
+        """Pick at random among the moves with the best game-theoretic value.
+
+        Positions are solved by negamax search, and the results are shared
+        by all solver players through the transposition table in
+        tictactoe.solver.
+        """
+        player = board.mask(self.token)
+        opponent = (board.masks[0] | board.masks[1]) & ~player
+        return self.prng.choice(solver.best_moves(player, opponent))
+
+
+class TablebaseComputer(SolverComputer):
+    difficulty = "Tablebase"
+    path = None  # see tablebase.open_tablebase
+
+    def move(self, board):
+        """Pick at random among the optimal moves stored in the tablebase.
+
+        The tablebase is memory-mapped on first use. Positions that aren't in
+        the tablebase, such as boards where the wrong player is to move, are
+        searched by the solver instead.
+        """
+        entry = tablebase.open_tablebase(self.path)[board.code()]
+        if entry is None or not entry.moves or not self._is_to_move(board):
+            return super().move(board)
+        return self.prng.choice(patterns.mask_spaces[entry.moves])
+
+    def _is_to_move(self, board):
+        """Is it this player's turn according to the number of tokens on the board?"""
+        n_first, n_second = (len(patterns.mask_spaces[m]) for m in board.masks)
+        return board.tokens.index(self.token) == (0 if n_first == n_second else 1)
+
+
+def count_lines(board, token):
+    """Score a board for a token by the lines it could still complete.
+
+    Each line with only the token's pieces in it is worth 4 ** n points for
+    n pieces, and lines with only the opponent's pieces count against it.
+    """
+    player = board.mask(token)
+    opponent = (board.masks[0] | board.masks[1]) & ~player
+    score = 0
+    for line in board.grid.line_masks:
+        mine, theirs = line & player, line & opponent
+        if mine and not theirs:
+            score += 4 ** bin(mine).count("1")
+        elif theirs and not mine:
+            score -= 4 ** bin(theirs).count("1")
+    return score
+
+
+class _SearchTimeout(Exception):
+    pass
+
+
+class AlphaBetaComputer(Computer):
+    difficulty = "Alpha-beta"
+
+    # Scores of won positions, above any score from count_lines
+    WIN_SCORE = 10 ** 9
+
+    def __init__(
+        self, label=None, seed=None, time_budget=0.05, max_depth=None, evaluate=None
+    ):
+        """A player that searches ahead until it runs out of time.
+
+        Args:
+            label: Label for the player. Optional.
+            seed: Seed for picking among equally good moves. Optional.
+            time_budget: Seconds to search for each move.
+            max_depth: Most moves to search ahead. If None, search until the
+                end of the game or the time budget.
+            evaluate: Function scoring a board for the token to move, as
+                evaluate(board, token), where the search stops before the
+                end of the game. Defaults to count_lines.
+        """
+        super().__init__(label=label, seed=seed)
+        self.time_budget = time_budget
+        self.max_depth = max_depth
+        self.evaluate = evaluate or count_lines
+
+    def move(self, board):
+        """Pick the best move from the deepest search finished in time.
+
+        Searches 1 move ahead, then 2, and so on with alpha-beta pruning,
+        until the time budget runs out. The search in progress when time
+        runs out is abandoned.
+        """
+        winning_move = self.find_winning_move(board)
+        if winning_move != -1:
+            return winning_move
+
+        blocking_move = self.find_blocking_move(board)
+        if blocking_move != -1:
+            return blocking_move
+
+        self._deadline = time.perf_counter() + self.time_budget
+        self._opponent = (set(board.tokens) - set(self.token)).pop()
+        moves = board.available()
+        self._killers = defaultdict(list)  # moves causing cutoffs by ply
+        self._history = defaultdict(int)  # cutoffs weighted by depth by space
+
+        self.prng.shuffle(moves)  # break ties between equal moves at random
+        best_move = moves[0]
+        max_depth = min(self.max_depth or len(moves), len(moves))
+        for depth in range(1, max_depth + 1):
+            try:
+                score, move = self._search_root(board, moves, depth)
+            except _SearchTimeout:
+                break
+            best_move = move
+            # search the best move first at the next depth
+            moves.remove(move)
+            moves.insert(0, move)
+            if abs(score) >= self.WIN_SCORE - board.size:
+                break  # the result of the game is known
+        return best_move
+
+    def _search_root(self, board, moves, depth):
+        alpha, beta = -self.WIN_SCORE - 1, self.WIN_SCORE + 1
+        best_move = moves[0]
+        for move in moves:
+            board.push(move, self.token)
+            try:
+                score = -self._negamax(
+                    board, depth - 1, 1, -beta, -alpha, self._opponent, self.token
+                )
+            finally:
+                board.pop()
+            if score > alpha:
+                alpha, best_move = score, move
+        return alpha, best_move
+
+    def _negamax(self, board, depth, ply, alpha, beta, token, opponent):
+        if time.perf_counter() > self._deadline:
+            raise _SearchTimeout()
+        if board.won:
+            return -(self.WIN_SCORE - ply)  # the opponent just won
+        if not board.free:
+            return 0
+        if depth == 0:
+            return self.evaluate(board, token)
+
+        for move in self._order_moves(board, ply, token, opponent):
+            board.push(move, token)
+            try:
+                score = -self._negamax(
+                    board, depth - 1, ply + 1, -beta, -alpha, opponent, token
+                )
+            finally:
+                board.pop()
+            if score >= beta:
+                self._add_cutoff(move, depth, ply)
+                return score
+            alpha = max(alpha, score)
+        return alpha
+
+    def _order_moves(self, board, ply, token, opponent):
+        """Return the open spaces with the ones most likely to cause cutoffs first.
+
+        Moves that win come first, then moves that block a win, then the
+        killer moves that caused cutoffs at this ply, then the rest by how
+        often they have caused cutoffs anywhere in the search.
+        """
+        wins = board.completing_spaces(token)
+        if wins:
+            return [(wins & -wins).bit_length() - 1]
+        blocks = board.completing_spaces(opponent)
+        if blocks:
+            # only blocking can avoid losing
+            return [(blocks & -blocks).bit_length() - 1]
+
+        killers = self._killers[ply]
+        history = self._history
+        return sorted(
+            board.available(),
+            key=lambda s: (s not in killers, -history[s]),
+        )
+
+    def _add_cutoff(self, move, depth, ply):
+        killers = self._killers[ply]
+        if move not in killers:
+            killers.insert(0, move)
+            del killers[2:]
+        self._history[move] += depth * depth
+
+
+class _Node:
+    """A position in a search tree, reached by a move of one of the players."""
+
+    __slots__ = ["player", "visits", "wins", "children", "untried"]
+
+    def __init__(self, player, untried):
+        self.player = player  # index of the token that moved into this position
+        self.visits = 0
+        self.wins = 0.0  # wins for that token, with ties counting half
+        self.children = {}
+        self.untried = untried
+
+
+def search_tree(board, token, rollouts=None, time_budget=None, seed=None, c=1.4):
+    """Grow a UCT search tree from a board and count the visits to each move.
+
+    The board is searched in place with push and pop, and left as it was.
+
+    Args:
+        board: The board to search, with token to move.
+        token: The token of the player to move.
+        rollouts: Most playouts to run. Optional.
+        time_budget: Most seconds to search for. Optional.
+        seed: Seed for the random playouts. Optional.
+        c: Exploration constant of the UCT formula.
+
+    Returns:
+        A dict of the number of visits by move.
+    """
+    prng = random.Random(seed)
+    deadline = time.perf_counter() + time_budget if time_budget else None
+    tokens = board.tokens
+    root = _Node(1 - tokens.index(token), board.available())
+    prng.shuffle(root.untried)
+
+    n = 0
+    while (rollouts is None or n < rollouts) and (
+        deadline is None or time.perf_counter() < deadline
+    ):
+        n += 1
+        node, path, n_moves = root, [root], 0
+
+        # Select moves down the tree until reaching a node with untried moves
+        while not node.untried and node.children:
+            log_visits = math.log(node.visits)
+            move, node = max(
+                node.children.items(),
+                key=lambda item: item[1].wins / item[1].visits
+                + c * math.sqrt(log_visits / item[1].visits),
+            )
+            board.push(move, tokens[node.player])
+            path.append(node)
+            n_moves += 1
+
+        # Add one of the untried moves to the tree
+        if node.untried and not board.won:
+            move = node.untried.pop()
+            player = 1 - node.player
+            board.push(move, tokens[player])
+            n_moves += 1
+            untried = [] if board.won else board.available()
+            prng.shuffle(untried)
+            node.children[move] = node = _Node(player, untried)
+            path.append(node)
+
+        # Play out the rest of the game at random
+        winner, player = None, node.player
+        if board.won:
+            winner = player
+        else:
+            moves = board.available()
+            prng.shuffle(moves)
+            for move in moves:
+                player = 1 - player
+                board.push(move, tokens[player])
+                n_moves += 1
+                if board.won:
+                    winner = player
+                    break
+
+        for _ in range(n_moves):
+            board.pop()
+
+        for node in path:
+            node.visits += 1
+            if winner is None:
+                node.wins += 0.5
+            elif winner == node.player:
+                node.wins += 1
+
+    return {move: child.visits for move, child in root.children.items()}
+
+
+class MCTSComputer(Computer):
+    difficulty = "MCTS"
+
+    def __init__(
+        self, label=None, seed=None, rollouts=1000, time_budget=None, workers=1, c=1.4
+    ):
+        """A player that picks moves by Monte Carlo tree search.
+
+        Args:
+            label: Label for the player. Optional.
+            seed: Seed for the searches. Optional.
+            rollouts: Most playouts per move in each worker. If None, search
+                until the time budget runs out.
+            time_budget: Most seconds to search for each move. Optional.
+            workers: Number of processes growing separate trees. The visit
+                counts of all the trees are added up to choose the move.
+            c: Exploration constant of the UCT formula.
+        """
+        super().__init__(label=label, seed=seed)
+        if rollouts is None and time_budget is None:
+            raise ValueError("MCTSComputer needs rollouts or a time_budget")
+        self.rollouts = rollouts
+        self.time_budget = time_budget
+        self.workers = workers
+        self.c = c
+        self._executor = None
+
+    def move(self, board):
+        """Pick the move visited most often by the searches."""
+        winning_move = self.find_winning_move(board)
+        if winning_move != -1:
+            return winning_move
+
+        blocking_move = self.find_blocking_move(board)
+        if blocking_move != -1:
+            return blocking_move
+
+        seeds = [self.prng.getrandbits(63) for _ in range(self.workers)]
+        args = (self.token, self.rollouts, self.time_budget)
+        if self.workers == 1:
+            visits = search_tree(board, *args, seeds[0], self.c)
+        else:
+            if self._executor is None:
+                # imported here because it's slow to import and rarely needed
+                from concurrent.futures import ProcessPoolExecutor
+
+                self._executor = ProcessPoolExecutor(self.workers)
+            futures = [
+                self._executor.submit(search_tree, board, *args, seed, self.c)
+                for seed in seeds
+            ]
+            visits = Counter()
+            for future in futures:
+                visits.update(future.result())
+        return max(sorted(visits), key=visits.get)
+
+    def close(self):
+        """Shut down the worker processes, if any were started."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+
+# Computer players by difficulty, in the order they are offered to the user
+difficulties = {
+    cls.difficulty: cls
+    for cls in [
+        EasyComputer,
+        MediumComputer,
+        HardComputer,
+        SolverComputer,
+        TablebaseComputer,
+    ]
+}
@@ -0,0 +1,211 @@
+"""A compact binary format for recorded games.
+
+A record file starts with a short file header and is followed by one
+record per finished game, so finished games can be appended to a file at
+any time. Each record has
+
+- an 8 byte header with the players' tokens, types and difficulties, a
+  flags byte saying which players have seeds, and the number of moves
+- a signed 64-bit seed for each player that has one
+- the moves, one nibble per move, with the first move in the high nibble
+
+The player listed first in a record is the player who moved first.
+
+Example:
+    >>> with open("games.rec", "ab") as f:
+    ...     writer = RecordWriter(f)
+    ...     writer.write(player1, player2, board.moves)
+    >>> with open("games.rec", "rb") as f:
+    ...     for record in read_records(f):
+    ...         print(record.moves)
+"""
+import struct
+from collections import namedtuple
+
+from tictactoe import exceptions, players
+from tictactoe.board import Board
+
+
+MAGIC = b"TTTR"
+VERSION = 1
+
+FILE_HEADER = struct.Struct("<4sB")  # magic, version
+RECORD_HEADER = struct.Struct("<2sBBBBBB")  # tokens, types, difficulties, flags, n
+SEED = struct.Struct("<q")
+
+# Codes are part of the file format, so only ever add to these tables
+player_types = ["Human", "Computer"]
+difficulties = [
+    None,
+    "Easy",
+    "Medium",
+    "Hard",
+    "Perfect",
+    "Tablebase",
+    "Alpha-beta",
+    "MCTS",
+]
+
+# A GameRecord is a finished game and the players who played it
+GameRecord = namedtuple(
+    "GameRecord", ["tokens", "player_types", "difficulties", "seeds", "moves"]
+)
+
+
+class RecordFormatError(exceptions.TicTacToeError):
+    pass
+
+
+def make_record(player1, player2, moves):
+    """Create a GameRecord for a game where player1 moved first.
+
+    Args:
+        player1: The Player who moved first.
+        player2: The Player who moved second.
+        moves: The Moves of the game, or the spaces played, in order.
+    """
+    order = (player1, player2)
+    return GameRecord(
+        tokens=(player1.token, player2.token),
+        player_types=tuple(
+            "Computer" if isinstance(p, players.Computer) else "Human" for p in order
+        ),
+        difficulties=tuple(getattr(p, "difficulty", None) for p in order),
+        seeds=tuple(getattr(p, "seed", None) for p in order),
+        moves=[getattr(move, "space", move) for move in moves],
+    )
+
+
+def _can_store_seed(seed):
+    return isinstance(seed, int) and -(2 ** 63) <= seed < 2 ** 63
+
+
+def encode(record):
+    """Return the bytes of a GameRecord.
+
+    Seeds that can't be stored as a signed 64-bit int are left out.
+    """
+    flags = 0
+    seeds = b""
+    for i, seed in enumerate(record.seeds):
+        if _can_store_seed(seed):
+            flags |= 1 << i
+            seeds += SEED.pack(seed)
+
+    moves = bytearray((len(record.moves) + 1) // 2)
+    for i, space in enumerate(record.moves):
+        moves[i // 2] |= space << 4 if i % 2 == 0 else space
+
+    try:
+        header = RECORD_HEADER.pack(
+            "".join(record.tokens).encode("ascii"),
+            player_types.index(record.player_types[0]),
+            player_types.index(record.player_types[1]),
+            difficulties.index(record.difficulties[0]),
+            difficulties.index(record.difficulties[1]),
+            flags,
+            len(record.moves),
+        )
+    except (ValueError, struct.error) as err:
+        raise RecordFormatError(f"can't encode {record}: {err}")
+    return header + seeds + bytes(moves)
+
+
+def decode_from(buffer, offset=0):
+    """Decode the record that starts at an offset in a buffer.
+
+    Returns:
+        A tuple of the GameRecord and the offset of the next record.
+    """
+    try:
+        header = RECORD_HEADER.unpack_from(buffer, offset)
+    except struct.error as err:
+        raise RecordFormatError(f"truncated record at {offset}: {err}")
+    tokens, type1, type2, diff1, diff2, flags, n_moves = header
+    offset += RECORD_HEADER.size
+
+    seeds = []
+    for i in range(2):
+        if flags & 1 << i:
+            seeds.append(SEED.unpack_from(buffer, offset)[0])
+            offset += SEED.size
+        else:
+            seeds.append(None)
+
+    n_bytes = (n_moves + 1) // 2
+    packed = bytes(buffer[offset : offset + n_bytes])
+    if len(packed) != n_bytes:
+        raise RecordFormatError(f"truncated moves at {offset}")
+    offset += n_bytes
+    moves = []
+    for byte in packed:
+        moves.append(byte >> 4)
+        moves.append(byte & 0x0F)
+    del moves[n_moves:]
+
+    record = GameRecord(
+        tokens=tuple(tokens.decode("ascii")),
+        player_types=(player_types[type1], player_types[type2]),
+        difficulties=(difficulties[diff1], difficulties[diff2]),
+        seeds=tuple(seeds),
+        moves=moves,
+    )
+    return record, offset
+
+
+class RecordWriter:
+    """Append records to a binary file, one write per finished game."""
+
+    def __init__(self, f):
+        """Wrap a file opened in binary write or append mode.
+
+        The file header is written if the file is empty.
+        """
+        self.f = f
+        if self.f.tell() == 0:
+            self.f.write(FILE_HEADER.pack(MAGIC, VERSION))
+
+    def write(self, player1, player2, moves):
+        """Record a finished game where player1 moved first."""
+        self.write_record(make_record(player1, player2, moves))
+
+    def write_record(self, record):
+        self.f.write(encode(record))
+        self.f.flush()
+
+    def close(self):
+        self.f.close()
+
+
+def read_header(f):
+    """Read and check the file header of a record file."""
+    header = f.read(FILE_HEADER.size)
+    if len(header) < FILE_HEADER.size:
+        raise RecordFormatError("missing file header")
+    magic, version = FILE_HEADER.unpack(header)
+    if magic != MAGIC or version != VERSION:
+        raise RecordFormatError(f"not a version {VERSION} record file")
+
+
+def read_records(f):
+    """Yield each GameRecord in a binary file, reading one record at a time."""
+    read_header(f)
+    while True:
+        header = f.read(RECORD_HEADER.size)
+        if not header:
+            return
+        if len(header) < RECORD_HEADER.size:
+            raise RecordFormatError("truncated record header")
+        flags, n_moves = header[-2], header[-1]
+        n_seeds = (flags & 1) + (flags >> 1 & 1)
+        body = f.read(n_seeds * SEED.size + (n_moves + 1) // 2)
+        record, _ = decode_from(header + body)
+        yield record
+
+
+def replay(record, board=None):
+    """Play the moves of a record onto a Board and return the board."""
+    board = board or Board(tokens=list(record.tokens))
+    for i, space in enumerate(record.moves):
+        board[space] = record.tokens[i % 2]
+    return board
@@ -1,13 +1,10 @@
 import enum
+import heapq
 import time
 import random
 import itertools
-import logging
 import curses
-from tictactoe import board, players, exceptions
-
-
-logger = logging.getLogger("game")
+from tictactoe import board, events, players, exceptions
 
 
 class GameType(enum.Enum):
@@ -34,9 +31,17 @@ class CursesWindow:
     def refresh(self):
         self.stdscr.refresh()
 
+    def noutrefresh(self):
+        """Mark the window for the next curses.doupdate() without updating."""
+        self.stdscr.noutrefresh()
+
     def getkey(self):
         return self.stdscr.getkey()
 
+    def timeout(self, delay):
+        """Make getkey wait at most delay ms for a key, or forever if negative."""
+        self.stdscr.timeout(delay)
+
     def move(self, y, x):
         self.stdscr.move(y, x)
 
@@ -44,6 +49,9 @@ class CursesWindow:
         self.stdscr.deleteln()
         self.stdscr.insertln()
 
+    def clrtoeol(self):
+        self.stdscr.clrtoeol()
+
     def clear(self):
         self.stdscr.clear()
 
@@ -51,14 +59,89 @@ class CursesWindow:
         return self.stdscr.subwin(nlines, ncols, start_y, start_x)
 
 
+class Scheduler:
+    """Run timed events while polling the keyboard.
+
+    Screens wait with the scheduler instead of sleeping, so the user can
+    quit or skip ahead at any time.
+    """
+
+    def __init__(self, window, quit_keys=("q",)):
+        self.window = window
+        self.quit_keys = quit_keys
+        self.events = []  # heap of (time, order, callback)
+        self._order = itertools.count()
+
+    def call_later(self, delay, callback):
+        """Call a function after delay seconds, while waiting."""
+        heapq.heappush(
+            self.events, (time.monotonic() + delay, next(self._order), callback)
+        )
+
+    def cancel_all(self):
+        self.events.clear()
+
+    def run_due(self):
+        """Call the events whose time has come, in order."""
+        now = time.monotonic()
+        while self.events and self.events[0][0] <= now:
+            _, _, callback = heapq.heappop(self.events)
+            callback()
+
+    def poll_key(self, timeout):
+        """Return the key pressed within timeout seconds, or None."""
+        self.window.timeout(max(1, int(timeout * 1000)))
+        try:
+            return self.window.getkey()
+        except curses.error:
+            return None  # no key was pressed in time
+        finally:
+            self.window.timeout(-1)
+
+    def wait(self, delay, skippable=True):
+        """Run events for delay seconds, or until a key is pressed.
+
+        A delay of 0 returns at once without reading any keys.
+
+        Args:
+            delay: Seconds to wait.
+            skippable: Whether pressing a key other than a quit key ends the
+                wait early.
+
+        Returns:
+            The key that ended the wait early, or None.
+
+        Raises:
+            PlayerQuitException: If a quit key is pressed.
+        """
+        deadline = time.monotonic() + delay
+        while True:
+            self.run_due()
+            now = time.monotonic()
+            if now >= deadline:
+                return None
+            timeout = deadline - now
+            if self.events:
+                timeout = min(timeout, self.events[0][0] - now)
+            key = self.poll_key(timeout)
+            if key is None:
+                continue
+            if key.lower() in self.quit_keys:
+                raise exceptions.PlayerQuitException()
+            if skippable:
+                return key
+
+
 class Screen:
     """Parent class for all TicTacToe screens."""
 
     prompt_y, error_y = 1, 2  # subclasses should overwrite these
     choice_delay = 0.5
+    quit_keys = ("q",)  # keys that quit the game while the screen is waiting
 
     def __init__(self, window):
         self.window = window
+        self.scheduler = Scheduler(window, quit_keys=self.quit_keys)
 
     def draw_title(self, title):
         self.window.addstr(0, 0, title)
@@ -235,7 +318,7 @@ class WelcomeScreen(Screen):
         # highlight selected game type
         self.draw_choices(self.game_types, highlight_line=key, start_y=3)
         self.window.refresh()
-        time.sleep(self.choice_delay)
+        self.scheduler.wait(self.choice_delay)
 
         return GameType(int(key))
 
@@ -243,6 +326,8 @@ class WelcomeScreen(Screen):
 class TokenScreen(Screen):
     """The TokenScreen allows players to pick their tokens."""
 
+    quit_keys = ()  # Q is a token
+
     def __init__(self, window, player1, player2):
         super().__init__(window)
         self.player1, self.player2 = player1, player2
@@ -279,17 +364,23 @@ class TokenScreen(Screen):
         self.error_y = self.prompt_y + 1
 
     def update_player_tokens(self):
-        log_fmt = "{player} selected token {player.token}"
-
         # Update Player 1 token
         self.update_player_token(self.player1, self.player1_token_yx)
-        logger.info(log_fmt.format(player=self.player1))
+        self.log_token(self.player1)
 
         # Update Player 2 token
         self.update_player_token(
             self.player2, self.player2_token_yx, opponent_token=self.player1.token
         )
-        logger.info(log_fmt.format(player=self.player2))
+        self.log_token(self.player2)
+
+    def log_token(self, player):
+        events.log(
+            "token",
+            f"{player} selected token {player.token}",
+            player=str(player),
+            token=player.token,
+        )
 
     def update_player_token(self, player, token_yx, opponent_token=None):
         while True:
@@ -327,7 +418,9 @@ class TokenScreen(Screen):
 class DifficultyScreen(Screen):
     """The DifficultyScreen asks the player to set the computer difficulties."""
 
-    difficulties = {"1": "Easy", "2": "Medium", "3": "Hard"}
+    difficulties = {
+        str(i): difficulty for i, difficulty in enumerate(players.difficulties, start=1)
+    }
 
     def __init__(self, window, player1, player2):
         super().__init__(window)
@@ -347,37 +440,42 @@ class DifficultyScreen(Screen):
         self.prompt_y = self.window.getyx()[0] + 2
 
     def update_computer_difficulties(self):
+        """Replace computer players with players of the selected difficulties."""
         if isinstance(self.player1, players.Computer):
-            self.get_difficulty(self.player1)
+            self.player1 = self.get_difficulty(self.player1)
 
         self.draw_choices(self.difficulties, highlight_key="1", start_y=2)
         if isinstance(self.player2, players.Computer):
-            self.get_difficulty(self.player2)
+            self.player2 = self.get_difficulty(self.player2)
+
+        return self.player1, self.player2
 
     def get_difficulty(self, player):
         self.draw_title(f"Set a difficulty for ")
         y, x = self.window.getyx()
         self.window.addstr(y, x, str(player), curses.color_pair(player.color_ix))
 
-        keys = ["1", "2", "3"]
-        prompt = f"Enter [1-3]: "
+        keys = list(self.difficulties)
+        prompt = f"Enter [1-{len(keys)}]: "
         key = self.get_key(prompt=prompt, keys=keys, default=keys[0], highlight=True)
 
         self.draw_choices(self.difficulties, highlight_line=key, start_y=2)
         self.window.refresh()
-        time.sleep(self.choice_delay)
+        self.scheduler.wait(self.choice_delay)
 
         difficulty = self.difficulties[key]
-        if difficulty == "Easy":
-            player = players.EasyComputer(player.label)
-        elif difficulty == "Medium":
-            player = players.MediumComputer(player.label)
-        elif difficulty == "Hard":
-            player = players.HardComputer(player.label)
-        else:
-            raise TicTacToeError()
+        computer = players.difficulties[difficulty](
+            player.label, seed=getattr(player, "seed", None)
+        )
+        computer.token, computer.color_ix = player.token, player.color_ix
 
-        logger.info(f"Set difficulty of {player} to {player.difficulty}")
+        events.log(
+            "difficulty",
+            f"Set difficulty of {computer} to {computer.difficulty}",
+            player=str(computer),
+            difficulty=computer.difficulty,
+        )
+        return computer
 
 
 class OrderScreen(Screen):
@@ -421,7 +519,7 @@ class OrderScreen(Screen):
             if random.random() >= 0.5:  # player2 goes first
                 self.player1, self.player2 = self.player2, self.player1
         else:
-            raise TicTacToeError()
+            raise exceptions.TicTacToeError()
 
         self.draw_choices(
             self.choices,
@@ -430,7 +528,7 @@ class OrderScreen(Screen):
             choice_colors=self.choice_colors,
         )
         self.window.refresh()
-        time.sleep(self.choice_delay)
+        self.scheduler.wait(self.choice_delay)
 
         return self.player1, self.player2
 
@@ -438,18 +536,38 @@ class OrderScreen(Screen):
 class PlayScreen(Screen):
     """The PlayScreen is for playing TicTacToe."""
 
-    def __init__(self, window, board, player1, player2):
+    def __init__(self, window, board, player1, player2, move_delay=None):
+        """Set up a game of two players on a board.
+
+        Args:
+            window: A CursesWindow.
+            board: The Board to play on.
+            player1, player2: The players, in the order they move.
+            move_delay: Seconds to pause on each move, e.g. 1 / frames per
+                second in computer games, or 0 to play at full speed.
+                Defaults to twice the choice delay. Pauses can be skipped by
+                pressing any key. After a human move, that key is kept for
+                the next move.
+        """
         super().__init__(window)
         self.player1, self.player2 = player1, player2
         self.board = board
+        self.move_delay = self.choice_delay * 2 if move_delay is None else move_delay
         self.board_window = BoardWindow.from_window(window, self.board)
 
         # Set prompt below board
-        self.prompt_y = 8
+        self.prompt_y = 2 + self.board_window.nlines
         self.error_y = self.prompt_y + 1
 
     def play(self):
+        """Play the game on the board until it's over and return the winner.
+
+        Returns:
+            The winning player, or None for a tie.
+        """
         winning_player = None
+        self.window.clear()
+        self.board_window.reset()
         while not self.board.is_over() and not self.board.is_tie():
             self.move_player(self.player1)
             if self.board.is_over():
@@ -468,23 +586,40 @@ class PlayScreen(Screen):
         self.window.clearln()
         if winning_player is None:
             self.window.addstr("The game ended in a tie.")
-            logger.info("Game ended in a tie")
+            events.log(
+                "result",
+                "Game ended in a tie",
+                winner=None,
+                moves=[move.space for move in self.board.moves],
+            )
         else:
             self.board_window.highlight_winning_pattern()
-            self.board_window.w.refresh()
+            self.board_window.refresh()
             self.window.addstr(
                 f"{winning_player} wins!",
                 curses.color_pair(winning_player.color_ix) | curses.A_STANDOUT,
             )
-            logger.info(f"{winning_player} wins")
+            events.log(
+                "result",
+                f"{winning_player} wins",
+                winner=str(winning_player),
+                moves=[move.space for move in self.board.moves],
+            )
 
         self.prompt_y += 1
         prompt = "Press any key."
-        self.get_key(prompt=prompt)
+        try:
+            self.get_key(prompt=prompt)
+        finally:
+            self.prompt_y -= 1
+        return winning_player
 
     def move_player(self, player):
-        self.window.clear()
+        # Only the title and the cells that changed are redrawn
+        self.window.move(0, 0)
+        self.window.clrtoeol()
         self.window.addstr(0, 0, f"{player}'s turn", curses.color_pair(player.color_ix))
+        self.window.noutrefresh()
         self.board_window.draw()
         if isinstance(player, players.Human):
             move = self.get_human_move(player)
@@ -495,12 +630,17 @@ class PlayScreen(Screen):
             raise TicTacToeException()
 
         self.board_window.highlight_square(move, player_color_ix=player.color_ix)
-        self.board_window.w.refresh()
-        time.sleep(self.choice_delay * 2)
+        self.board_window.refresh()
+        key = self.scheduler.wait(self.move_delay)
+        if key is not None and isinstance(player, players.Human) and len(key) == 1:
+            # After a human move, the key is the next player's, so keep it
+            curses.ungetch(key)
 
     def get_human_move(self, human_player):
-        prompt = "Enter [0-9] or Q to quit: "
-        keys = list(map(str, range(10))) + ["q"]
+        # Spaces are picked with a single key press
+        spaces = list(map(str, range(min(self.board.size, 10))))
+        prompt = f"Enter [0-{spaces[-1]}] or Q to quit: "
+        keys = spaces + ["q"]
         while True:
             key = self.get_key(prompt=prompt, keys=keys)
             if key == "q":
@@ -512,25 +652,47 @@ class PlayScreen(Screen):
             except exceptions.SpotTakenByOpponentError:
                 error_message = "Your opponent has already claimed that square."
             else:
-                logger.info(f"{human_player} placed a token on {key}")
+                self.log_move(human_player, int(key))
                 break
             # If the loop wasn't broken, there was an error
             self.draw_error_message(error_message)
 
+        self.draw_error_message(None)  # clear error message
         return int(key)
 
     def show_computer_move(self, computer_player):
         """Animate the Computer's move."""
-        self.draw_prompt(f"{computer_player}'s turn...")
+        self.draw_prompt(f"{computer_player}'s turn")
         self.window.refresh()
         move = computer_player.move(self.board)
         self.board[move] = computer_player.token
-        logger.info(f"{computer_player} placed a token on {move}")
-        self.window.refresh()
-        time.sleep(self.choice_delay * 2)
+        self.log_move(computer_player, move)
+
+        if self.move_delay:
+            # Draw "..." one dot at a time while the computer "thinks"
+            for i in range(3):
+                self.scheduler.call_later(
+                    i * self.move_delay / 3, self.draw_thinking_dot
+                )
+            self.scheduler.wait(self.move_delay)
+            self.scheduler.cancel_all()
+
         self.board_window.draw()
         return int(move)
 
+    def log_move(self, player, space):
+        events.log(
+            "move",
+            f"{player} placed a token on {space}",
+            player=str(player),
+            token=player.token,
+            space=space,
+        )
+
+    def draw_thinking_dot(self):
+        self.window.addstr(".")
+        self.window.refresh()
+
 
 class EndScreen(Screen):
     def __init__(self, stdscr, board, board_window):
@@ -538,63 +700,123 @@ class EndScreen(Screen):
         self.board_window = board_window
 
         # Set prompt below board
-        self.prompt_y = 8
+        self.prompt_y = 2 + board_window.nlines
 
     def draw(self):
         self.window.clear()
         self.draw_title("Game over!")
         self.window.refresh()
 
-    def ask_play_again(self):
+    def ask_play_again(self, totals=None, details=None):
+        """Ask the player to play again, showing the totals of past games.
+
+        Args:
+            totals: A line about the games played so far. Optional.
+            details: More lines of text to show below the prompt, e.g. a
+                table of move latencies. Lines that don't fit are left out.
+        """
         self.window.clear()
         self.draw_title("Game over!")
+        if totals:
+            self.draw_description(totals)
+        self.board_window.invalidate()
         self.board_window.draw()
         self.board_window.highlight_winning_pattern()
-        self.board_window.w.refresh()
+        self.board_window.refresh()
+        if details:
+            self.draw_details(details)
         prompt = "Press ENTER to play again or any other key to exit."
         key = self.get_key(prompt)
         return key == "\n"
 
+    def draw_details(self, details):
+        for y, line in enumerate(details.splitlines(), start=self.prompt_y + 2):
+            try:
+                self.window.addstr(y, 0, line)
+            except curses.error:
+                break  # the rest of the lines are below the screen
+
 
 class BoardWindow:
     def __init__(self, window, board):
         self.w = window
         self.board = board
 
-        rows_with_tokens = [0, 2, 4]
-        cols_with_tokens = [1, 5, 9]
+        # Open spaces are labeled by index, so cells are as wide as the labels
+        self.label_width = len(str(board.size - 1))
+        self.cell_width = self.label_width + 3  # a space on each side and a border
+        self.nlines = 2 * board.rows
+        self.ncols = self.cell_width * board.cols
+
+        rows_with_tokens = [2 * r for r in range(board.rows)]
+        cols_with_tokens = [self.cell_width * c + 1 for c in range(board.cols)]
         self.token_yxs = list(itertools.product(rows_with_tokens, cols_with_tokens))
         self.space_colors = {}
+        self.frame = None  # text and attributes of each cell as last drawn
 
     @classmethod
-    def from_window(cls, window, board, nlines=6, ncols=12, start_y=2, start_x=3):
-        window = window.subwin(nlines, ncols, start_y, start_x)
-        return BoardWindow(window, board)
+    def from_window(cls, window, board, nlines=None, ncols=None, start_y=2, start_x=3):
+        """Create a BoardWindow in a subwindow big enough for the board."""
+        board_window = cls(None, board)
+        board_window.w = window.subwin(
+            nlines or board_window.nlines,
+            ncols or board_window.ncols,
+            start_y,
+            start_x,
+        )
+        return board_window
+
+    def invalidate(self):
+        """Redraw the whole board on the next draw, e.g. after a clear."""
+        self.frame = None
+
+    def reset(self):
+        """Forget the colors of the last game and redraw everything."""
+        self.space_colors = {}
+        self.invalidate()
 
     def draw(self):
+        """Draw the cells that changed since the last draw.
+
+        The grid and every cell are drawn the first time, and after
+        invalidate is called.
+        """
+        if self.frame is None:
+            self.draw_grid()
+            self.frame = [None] * self.board.size
+
+        for space in range(self.board.size):
+            cell = self.cell(space)
+            if cell != self.frame[space]:
+                y, x = self.token_yxs[space]
+                self.w.addstr(y, x, *cell)
+                self.frame[space] = cell
+
+        self.refresh()
+
+    def draw_grid(self):
         v, h, p = "|", "=", "+"
-        self.w.clear()
-
-        # fmt: off
-        self.w.addstr(0, 0, " {0} {v} {1} {v} {2} ".format(
-            self.board[0], self.board[1], self.board[2], v=v
-        ))
-        self.w.addstr(1, 0, f"{h}{h}{h}{p}{h}{h}{h}{p}{h}{h}{h}")
-        self.w.addstr(2, 0, " {0} {v} {1} {v} {2} ".format(
-            self.board[3], self.board[4], self.board[5], v=v
-        ))
-        self.w.addstr(3, 0, f"{h}{h}{h}{p}{h}{h}{h}{p}{h}{h}{h}")
-        self.w.addstr(4, 0, " {0} {v} {1} {v} {2} ".format(
-            self.board[6], self.board[7], self.board[8], v=v
-        ))
-        # fmt: on
-
-        # update spaces taken by player tokens with correct colors
-        for space, color_ix in self.space_colors.items():
-            y, x = self.token_yxs[space]
-            self.w.chgat(y, x, 1, curses.color_pair(color_ix))
-
-        self.w.refresh()
+        self.w.erase()
+
+        border = p.join([h * (self.label_width + 2)] * self.board.cols)
+        row = v.join([" " * (self.label_width + 2)] * self.board.cols)
+        for r in range(self.board.rows):
+            self.w.addstr(2 * r, 0, row)
+            if r < self.board.rows - 1:
+                self.w.addstr(2 * r + 1, 0, border)
+
+    def cell(self, space):
+        """Return the text and attributes of a space as it should be drawn."""
+        text = f"{self.board[space]:<{self.label_width}}"
+        if space in self.space_colors:
+            # spaces taken by player tokens have the player's color
+            return text, curses.color_pair(self.space_colors[space])
+        return text, curses.A_NORMAL
+
+    def refresh(self):
+        """Send the changes to the terminal in a single update."""
+        self.w.noutrefresh()
+        curses.doupdate()
 
     def highlight_square(self, i, player_color_ix=None):
         y, x = self.token_yxs[i]
@@ -606,16 +828,25 @@ class BoardWindow:
             self.space_colors[i] = player_color_ix
         else:
             self.w.chgat(y, x, 1, curses.A_STANDOUT)
+        self._mark_changed(i)
 
     def highlight_winning_pattern(self, *ixs):
         spaces = self.board.find_winning_pattern()
         for s in spaces:
+            if s < 0:  # no winning pattern
+                continue
             y, x = self.token_yxs[s]
             if self.space_colors and s in self.space_colors:
                 color_ix = self.space_colors[s]
                 self.w.chgat(y, x, 1, curses.color_pair(color_ix) | curses.A_STANDOUT)
             else:
                 self.w.chgat(y, x, 1, curses.A_STANDOUT)
+            self._mark_changed(s)
+
+    def _mark_changed(self, space):
+        """Redraw a space on the next draw, because it was highlighted."""
+        if self.frame is not None:
+            self.frame[space] = None
 
 
 def configure_curses():
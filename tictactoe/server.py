@@ -0,0 +1,249 @@
+"""Serve games against computer players over TCP.
+
+Run a server on localhost with
+
+    python -m tictactoe.server --port 9999
+
+Clients send one command per line and get one reply per line. Every
+reply starts with OK or ERR. Games are identified by an id, so a client
+can play many games on one connection, and a game can be continued from
+another connection.
+
+    NEW [difficulty] [token]  start a game against a computer, playing
+                              token (X by default, X moves first)
+    MOVE <id> <space>         take a space; the computer replies at once
+    STATE <id>                show a game
+    RESIGN <id>               give up a game and end it
+    QUIT                      close the connection
+
+The replies to NEW, MOVE, STATE and RESIGN are
+
+    OK <id> <board> <status>
+
+where board lists the spaces from 0 to 8, with "." for open spaces, and
+status is "playing", "tie", "resigned" or "won:<token>". Finished games
+are forgotten once their final state has been sent, and games nobody has
+touched for a while are expired.
+"""
+import argparse
+import asyncio
+import itertools
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from tictactoe import exceptions, players
+from tictactoe.board import Board
+
+
+PLAYING, TIE, RESIGNED = "playing", "tie", "resigned"
+
+
+class ProtocolError(exceptions.TicTacToeError):
+    pass
+
+
+class Session:
+    """A game between a client and a computer player."""
+
+    def __init__(self, game_id, computer, token):
+        self.game_id = game_id
+        self.computer = computer
+        self.token = token
+        self.board = Board(tokens=["X", "O"])
+        self.lock = asyncio.Lock()
+        self.last_active = time.monotonic()
+        self.resigned = False
+
+    def status(self):
+        if self.resigned:
+            return RESIGNED
+        if self.board.is_over():
+            return f"won:{self.board.moves[-1].token}"
+        if self.board.is_tie():
+            return TIE
+        return PLAYING
+
+    def state(self):
+        """Format the game for a reply."""
+        board = "".join(
+            token if token in self.board.tokens else "." for token in self.board.b
+        )
+        return f"{self.game_id} {board} {self.status()}"
+
+
+class GameServer:
+    def __init__(self, difficulty="Hard", idle_timeout=300.0, executor=None):
+        """Host games between clients and computer players.
+
+        Args:
+            difficulty: Difficulty of the computer in games where the
+                client doesn't pick one.
+            idle_timeout: Seconds before a game nobody has moved in is
+                expired.
+            executor: A concurrent.futures.Executor to run computer moves
+                in. If None, computer moves are run in the event loop, which
+                is fastest for players that move in microseconds.
+        """
+        self.difficulty = difficulty
+        self.idle_timeout = idle_timeout
+        self.executor = executor
+        self.sessions = {}
+        self.server = None
+        self._ids = itertools.count(1)
+        self._reaper = None
+
+    async def start(self, host="127.0.0.1", port=0):
+        """Start listening, and return the port being listened on."""
+        self.server = await asyncio.start_server(self.handle, host, port)
+        self._reaper = asyncio.ensure_future(self.expire_sessions())
+        return self.server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        self._reaper.cancel()
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def serve_forever(self, host="127.0.0.1", port=0):
+        await self.start(host, port)
+        try:
+            await self.server.serve_forever()
+        finally:
+            await self.close()
+
+    async def handle(self, reader, writer):
+        """Reply to the commands from one connection until it closes."""
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                command = line.decode("utf-8", "replace").split()
+                if command and command[0].upper() == "QUIT":
+                    break
+                try:
+                    reply = "OK " + await self.dispatch(command)
+                except exceptions.TicTacToeError as err:
+                    reply = f"ERR {type(err).__name__} {err}".rstrip()
+                writer.write(reply.encode("utf-8") + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def dispatch(self, command):
+        """Run a command and return the reply without OK."""
+        if not command:
+            raise ProtocolError("empty command")
+        name, args = command[0].upper(), command[1:]
+        if name == "NEW":
+            return await self.new_game(*args[:2])
+        if len(args) < 1:
+            raise ProtocolError(f"{name} needs a game id")
+        session = self.find_session(args[0])
+        session.last_active = time.monotonic()
+        if name == "MOVE":
+            if len(args) != 2:
+                raise ProtocolError("MOVE needs a game id and a space")
+            return await self.move(session, args[1])
+        if name == "STATE":
+            return self.reply(session)
+        if name == "RESIGN":
+            session.resigned = True
+            return self.reply(session)
+        raise ProtocolError(f"unknown command {name}")
+
+    def find_session(self, game_id):
+        try:
+            return self.sessions[game_id]
+        except KeyError:
+            raise ProtocolError(f"no game {game_id}")
+
+    def reply(self, session):
+        """Format the state of a game, forgetting it if it's finished."""
+        if session.status() != PLAYING:
+            self.sessions.pop(session.game_id, None)
+        return session.state()
+
+    async def new_game(self, difficulty=None, token="X"):
+        difficulty = difficulty or self.difficulty
+        try:
+            computer = players.difficulties[difficulty]()
+        except KeyError:
+            raise ProtocolError(f"unknown difficulty {difficulty}")
+        token = token.upper()
+        if token not in ["X", "O"]:
+            raise exceptions.ImproperTokenError(f"token '{token}' is not X or O")
+        computer.token = "O" if token == "X" else "X"
+
+        session = Session(str(next(self._ids)), computer, token)
+        self.sessions[session.game_id] = session
+        if computer.token == "X":
+            async with session.lock:
+                await self.computer_move(session)
+        return self.reply(session)
+
+    async def move(self, session, space):
+        async with session.lock:
+            if session.status() != PLAYING:
+                return self.reply(session)
+            session.board[space] = session.token
+            if session.status() == PLAYING:
+                await self.computer_move(session)
+        return self.reply(session)
+
+    async def computer_move(self, session):
+        computer, board = session.computer, session.board
+        if self.executor is None:
+            move = computer.move(board)
+        else:
+            loop = asyncio.get_event_loop()
+            move = await loop.run_in_executor(self.executor, computer.move, board)
+        board[move] = computer.token
+
+    async def expire_sessions(self):
+        """Forget games nobody has touched within the idle timeout."""
+        while True:
+            await asyncio.sleep(min(self.idle_timeout, 60.0))
+            cutoff = time.monotonic() - self.idle_timeout
+            expired = [
+                game_id
+                for game_id, session in self.sessions.items()
+                if session.last_active < cutoff and not session.lock.locked()
+            ]
+            for game_id in expired:
+                del self.sessions[game_id]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("-p", "--port", type=int, default=9999)
+    parser.add_argument(
+        "-d",
+        "--difficulty",
+        default="Hard",
+        choices=list(players.difficulties),
+        help="difficulty of computers in new games by default",
+    )
+    parser.add_argument(
+        "--idle-timeout", type=float, default=300.0, help="seconds to keep idle games"
+    )
+    parser.add_argument(
+        "--threads",
+        type=int,
+        default=0,
+        help="threads to run computer moves in (default: run them in the event loop)",
+    )
+    args = parser.parse_args(argv)
+
+    executor = ThreadPoolExecutor(args.threads) if args.threads else None
+    server = GameServer(args.difficulty, args.idle_timeout, executor)
+    try:
+        asyncio.run(server.serve_forever(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+"""Answer best move queries over HTTP.
+
+Run the service on localhost with
+
+    python -m tictactoe.service --port 8000
+
+and POST a JSON object to /move with a difficulty and either one
+position or a list of positions. A position is the list of spaces played
+so far, in order, with X moving first.
+
+    $ curl -d '{"difficulty": "Hard", "position": [0, 4]}' localhost:8000/move
+    {"move": 8}
+    $ curl -d '{"positions": [[], [4]]}' localhost:8000/move
+    {"moves": [0, 0]}
+
+Requests that arrive within a few milliseconds of each other are gathered
+into one batch, and each computer player answers all of its positions in
+the batch with one call to move_many.
+"""
+import argparse
+import json
+import queue
+import threading
+import time
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from tictactoe import exceptions, players
+from tictactoe.board import Board
+
+
+class PositionError(exceptions.TicTacToeError):
+    pass
+
+
+def make_board(position):
+    """Play a list of spaces onto a new Board, checking every move."""
+    if not isinstance(position, list):
+        raise PositionError(f"position {position!r} is not a list of spaces")
+    board = Board(tokens=["X", "O"])
+    for turn, space in enumerate(position):
+        if board.is_over():
+            raise PositionError(f"move {turn} is after the game was won")
+        if not isinstance(space, int) or isinstance(space, bool):
+            raise PositionError(f"space {space!r} is not an int")
+        board[space] = board.tokens[turn % 2]
+    if board.is_over() or board.is_tie():
+        raise PositionError(f"the game is already over after {position}")
+    return board
+
+
+class _Query:
+    """Positions from one request, waiting for their moves."""
+
+    def __init__(self, difficulty, boards):
+        self.difficulty = difficulty
+        self.boards = boards
+        self.moves = None
+        self.error = None
+        self.done = threading.Event()
+
+
+class MoveBatcher:
+    """Gather positions from many threads and answer them in batches."""
+
+    def __init__(self, window=0.002, seed=None):
+        """Start the thread that answers batches.
+
+        Args:
+            window: Seconds to wait for more queries after the first query
+                of a batch arrives.
+            seed: Seed for the computer players. Optional.
+        """
+        self.window = window
+        self.queries = queue.Queue()
+        self.n_batches = 0
+        self.computers = {}
+        for difficulty, cls in players.difficulties.items():
+            for token in ["X", "O"]:
+                if seed is not None:
+                    computer = cls(seed=f"{seed}:{difficulty}:{token}")
+                else:
+                    computer = cls()
+                computer.token = token
+                self.computers[difficulty, token] = computer
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def moves(self, difficulty, boards):
+        """Return a move for each board, waiting for the batch they are in."""
+        if not isinstance(difficulty, str) or difficulty not in players.difficulties:
+            raise PositionError(f"unknown difficulty {difficulty!r}")
+        query = _Query(difficulty, boards)
+        self.queries.put(query)
+        query.done.wait()
+        if query.error is not None:
+            raise query.error
+        return query.moves
+
+    def close(self):
+        self.queries.put(None)
+        self._thread.join()
+
+    def _run(self):
+        while True:
+            batch = [self.queries.get()]
+            deadline = time.perf_counter() + self.window
+            while batch[-1] is not None:
+                timeout = deadline - time.perf_counter()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(self.queries.get(timeout=timeout))
+                except queue.Empty:
+                    break
+
+            stop = batch[-1] is None
+            batch = [query for query in batch if query is not None]
+            if batch:
+                self._answer(batch)
+            if stop:
+                return
+
+    def _answer(self, batch):
+        """Answer every query in a batch with one move_many call per computer."""
+        self.n_batches += 1
+        groups = defaultdict(list)  # (query, index) of the boards for each computer
+        for query in batch:
+            query.moves = [None] * len(query.boards)
+            for i, board in enumerate(query.boards):
+                token = board.tokens[len(board.moves) % 2]
+                groups[query.difficulty, token].append((query, i))
+
+        for key, items in groups.items():
+            boards = [query.boards[i] for query, i in items]
+            try:
+                moves = self.computers[key].move_many(boards)
+            except Exception as err:
+                for query, _ in items:
+                    query.error = err
+                continue
+            for (query, i), move in zip(items, moves):
+                query.moves[i] = move
+
+        for query in batch:
+            query.done.set()
+
+
+class MoveRequestHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        if self.path != "/move":
+            self.send_json(404, {"error": f"no such endpoint {self.path}"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            query = json.loads(self.rfile.read(length))
+            if not isinstance(query, dict):
+                raise PositionError("the request is not a JSON object")
+            difficulty = query.get("difficulty", "Hard")
+            if "positions" in query:
+                if not isinstance(query["positions"], list):
+                    raise PositionError("positions is not a list")
+                boards = [make_board(position) for position in query["positions"]]
+                reply = {"moves": self.server.batcher.moves(difficulty, boards)}
+            else:
+                board = make_board(query.get("position", []))
+                reply = {"move": self.server.batcher.moves(difficulty, [board])[0]}
+        except (ValueError, exceptions.TicTacToeError) as err:
+            self.send_json(400, {"error": f"{type(err).__name__}: {err}"})
+            return
+        except Exception as err:
+            self.send_json(500, {"error": f"{type(err).__name__}: {err}"})
+            return
+        self.send_json(200, reply)
+
+    def send_json(self, status, obj):
+        body = json.dumps(obj).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # don't write a line to stderr for every request
+
+
+class MoveServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128  # many clients connect at once
+
+    def __init__(self, address, window=0.002, seed=None):
+        super().__init__(address, MoveRequestHandler)
+        self.batcher = MoveBatcher(window=window, seed=seed)
+
+    def server_close(self):
+        super().server_close()
+        self.batcher.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("-p", "--port", type=int, default=8000)
+    parser.add_argument(
+        "--window", type=float, default=2.0, help="milliseconds to gather a batch"
+    )
+    parser.add_argument("-s", "--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    server = MoveServer((args.host, args.port), args.window / 1000, args.seed)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Perfect play by negamax search with alpha-beta pruning.
+
+A position is a pair of 9-bit masks, (player, opponent), from the point of
+view of the player to move. Search results are stored in a transposition
+table keyed on the canonical form of the position under the 8 symmetries
+of the board, so each position only has to be searched once per process.
+"""
+from tictactoe import patterns
+
+
+# Transposition table flags: is the stored value exact or only a bound?
+EXACT, LOWER, UPPER = 0, 1, 2
+
+# Scores are bounded by a win with every space still open
+MAX_SCORE = 10
+
+transpositions = {}
+
+
+def canonical(player, opponent):
+    """Return the smallest key of a position over all of its symmetries."""
+    return min(sym[player] << 9 | sym[opponent] for sym in patterns.symmetric_masks)
+
+
+def negamax(player, opponent, alpha=-MAX_SCORE, beta=MAX_SCORE):
+    """Return the value of a position for the player to move.
+
+    A win scores one more than the number of open spaces left when the game
+    ends, so faster wins score higher and slower losses score less badly.
+    A tie scores 0.
+    """
+    free = patterns.full_mask & ~(player | opponent)
+    if patterns.win_table[opponent]:
+        return -(len(patterns.mask_spaces[free]) + 1)
+    if not free:
+        return 0
+
+    key = canonical(player, opponent)
+    entry = transpositions.get(key)
+    if entry is not None:
+        flag, value = entry
+        if flag == EXACT:
+            return value
+        elif flag == LOWER:
+            alpha = max(alpha, value)
+        else:
+            beta = min(beta, value)
+        if alpha >= beta:
+            return value
+
+    original_alpha = alpha
+    best = -MAX_SCORE
+    for space in patterns.mask_spaces[free]:
+        value = -negamax(opponent, player | 1 << space, -beta, -alpha)
+        if value > best:
+            best = value
+            if best > alpha:
+                alpha = best
+                if alpha >= beta:
+                    break
+
+    if best <= original_alpha:
+        flag = UPPER
+    elif best >= beta:
+        flag = LOWER
+    else:
+        flag = EXACT
+    transpositions[key] = (flag, best)
+    return best
+
+
+def score_moves(player, opponent):
+    """Return a dict of the open spaces to their exact values for the player."""
+    free = patterns.full_mask & ~(player | opponent)
+    return {
+        space: -negamax(opponent, player | 1 << space)
+        for space in patterns.mask_spaces[free]
+    }
+
+
+def best_moves(player, opponent):
+    """Return the list of spaces that achieve the best value for the player."""
+    scores = score_moves(player, opponent)
+    best = max(scores.values())
+    return [space for space, value in scores.items() if value == best]
@@ -0,0 +1,203 @@
+"""A precomputed table of perfect play for every reachable position.
+
+The tablebase is a binary file with a fixed-width record for every base-3
+board code (see Board.code), so the record for a position is found by
+offset alone. Each record holds the game-theoretic value of the position
+for the player to move, the number of plies until the game ends under
+perfect play, and a 9-bit mask of the optimal moves. Codes of unreachable
+positions are marked as such.
+
+Build the file once with
+
+    python -m tictactoe.tablebase [path]
+
+and read it with open_tablebase, which memory-maps the file so that every
+process using the same file shares a single copy in the page cache. Until
+the file is built, each process builds the tablebase in memory instead,
+and nothing is written.
+"""
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from collections import namedtuple
+
+from tictactoe import patterns, solver
+
+
+MAGIC = b"TTTB"
+VERSION = 1
+N_CODES = 3 ** 9
+
+HEADER = struct.Struct("<4sHH")  # magic, version, number of records
+RECORD = struct.Struct("<bBH")  # value, distance to end, optimal moves
+
+WIN, DRAW, LOSS = 1, 0, -1
+UNREACHABLE = -128
+
+default_path = os.path.join(os.path.dirname(__file__), "tablebase.bin")
+
+# An Entry is the perfect play record for a position
+Entry = namedtuple("Entry", ["value", "distance", "moves"])
+
+_tablebases = {}  # open tablebases by path
+
+
+def reachable_positions():
+    """Yield every position reachable from the empty board as (first, second) masks."""
+    seen = {(0, 0)}
+    stack = [(0, 0)]
+    while stack:
+        first, second = stack.pop()
+        yield first, second
+
+        if patterns.win_table[first] or patterns.win_table[second]:
+            continue
+        free = patterns.full_mask & ~(first | second)
+        first_to_move = len(patterns.mask_spaces[first]) == len(
+            patterns.mask_spaces[second]
+        )
+        for space in patterns.mask_spaces[free]:
+            if first_to_move:
+                position = (first | 1 << space, second)
+            else:
+                position = (first, second | 1 << space)
+            if position not in seen:
+                seen.add(position)
+                stack.append(position)
+
+
+def solve_position(first, second):
+    """Return the Entry for a position from the point of view of the player to move."""
+    free = patterns.full_mask & ~(first | second)
+    if len(patterns.mask_spaces[first]) == len(patterns.mask_spaces[second]):
+        player, opponent = first, second
+    else:
+        player, opponent = second, first
+
+    if patterns.win_table[opponent]:
+        return Entry(LOSS, 0, 0)
+    if not free:
+        return Entry(DRAW, 0, 0)
+
+    # Solver scores are one more than the number of spaces left open at the
+    # end of the game, so the distance to the end is recovered from them.
+    scores = solver.score_moves(player, opponent)
+    best = max(scores.values())
+    moves = patterns.make_mask(s for s, score in scores.items() if score == best)
+    n_free = len(patterns.mask_spaces[free])
+    if best > 0:
+        return Entry(WIN, n_free - best + 1, moves)
+    elif best < 0:
+        return Entry(LOSS, n_free + best + 1, moves)
+    else:
+        return Entry(DRAW, n_free, moves)
+
+
+def build_data():
+    """Solve every reachable position.
+
+    Returns:
+        A tuple of (tablebase bytes, number of reachable positions).
+    """
+    data = bytearray(HEADER.size + RECORD.size * N_CODES)
+    HEADER.pack_into(data, 0, MAGIC, VERSION, N_CODES)
+    for code in range(N_CODES):
+        RECORD.pack_into(data, HEADER.size + RECORD.size * code, UNREACHABLE, 0, 0)
+
+    n_positions = 0
+    for first, second in reachable_positions():
+        code = patterns.ternary[first] + 2 * patterns.ternary[second]
+        RECORD.pack_into(
+            data, HEADER.size + RECORD.size * code, *solve_position(first, second)
+        )
+        n_positions += 1
+    return bytes(data), n_positions
+
+
+def build(path=default_path):
+    """Solve every reachable position and write the tablebase to a file.
+
+    The file is written to a temporary file first and then moved into place,
+    so readers never see a partially written tablebase.
+
+    Returns:
+        The number of reachable positions in the tablebase.
+    """
+    data, n_positions = build_data()
+    dirname = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=dirname, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return n_positions
+
+
+class Tablebase:
+    """A read-only view of a memory-mapped tablebase file."""
+
+    def __init__(self, path=None):
+        """
+        Args:
+            path: Path of a tablebase file. If None, the tablebase is built
+                in memory.
+        """
+        if path is None:
+            self.data, _ = build_data()
+            path = "<memory>"
+        else:
+            with open(path, "rb") as f:
+                self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, n_codes = HEADER.unpack_from(self.data, 0)
+        if magic != MAGIC or version != VERSION or n_codes != N_CODES:
+            raise ValueError(f"{path} is not a version {VERSION} tablebase")
+
+    def __getitem__(self, code):
+        """Return the Entry for a board code, or None if it can't be reached."""
+        value, distance, moves = RECORD.unpack_from(
+            self.data, HEADER.size + RECORD.size * code
+        )
+        if value == UNREACHABLE:
+            return None
+        return Entry(value, distance, moves)
+
+
+def open_tablebase(path=None):
+    """Return the tablebase at path.
+
+    Tablebases are opened once per process and shared by every caller.
+
+    Args:
+        path: Path of a tablebase file. If None, the file at default_path
+            is used if it has been built, and otherwise the tablebase is
+            built in memory.
+
+    Raises:
+        FileNotFoundError: If there is no file at path.
+    """
+    tablebase = _tablebases.get(path)
+    if tablebase is None:
+        if path is None:
+            built = os.path.exists(default_path)
+            tablebase = Tablebase(default_path if built else None)
+        elif os.path.exists(path):
+            tablebase = Tablebase(path)
+        else:
+            raise FileNotFoundError(
+                f"no tablebase at {path}; "
+                f"build it with: python -m tictactoe.tablebase {path}"
+            )
+        _tablebases[path] = tablebase
+    return tablebase
+
+
+if __name__ == "__main__":
+    path = sys.argv[1] if len(sys.argv) > 1 else default_path
+    n_positions = build(path)
+    print(f"Wrote {n_positions} positions to {path}")
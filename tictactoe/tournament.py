@@ -0,0 +1,193 @@
+"""Play every pairing of computer players against each other.
+
+Run a tournament from the command line with
+
+    python -m tictactoe.tournament --games 10000 --workers 8
+
+Games are split into fixed-size chunks, and each chunk gets its own seeds
+derived from the tournament seed, the pairing and the chunk number. The
+results of a tournament are therefore the same for any number of workers.
+"""
+import argparse
+import itertools
+import multiprocessing
+import random
+import sys
+
+from tictactoe import engine, instrument, players
+
+
+def make_chunks(names, n_games, chunk_size):
+    """Split the games for every ordered pairing of players into chunks.
+
+    Returns:
+        A list of (name1, name2, chunk_ix, n_games) tuples, where the player
+        called name1 goes first.
+    """
+    chunks = []
+    for name1, name2 in itertools.product(names, repeat=2):
+        for chunk_ix, start in enumerate(range(0, n_games, chunk_size)):
+            chunks.append((name1, name2, chunk_ix, min(chunk_size, n_games - start)))
+    return chunks
+
+
+def chunk_seeds(seed, name1, name2, chunk_ix):
+    """Return the seeds for the two players in a chunk of games."""
+    prng = random.Random(f"{seed}:{name1}:{name2}:{chunk_ix}")
+    return prng.getrandbits(63), prng.getrandbits(63)
+
+
+def play_chunk(seed, chunk):
+    """Play a chunk of games and return the tally from the first player's view.
+
+    Returns:
+        A tuple of (name1, name2, wins, draws, losses).
+    """
+    name1, name2, chunk_ix, n_games = chunk
+    seed1, seed2 = chunk_seeds(seed, name1, name2, chunk_ix)
+    player1 = players.difficulties[name1](name1, seed=seed1)
+    player2 = players.difficulties[name2](name2, seed=seed2)
+
+    wins = draws = losses = 0
+    for result in engine.play_many(player1, player2, n_games):
+        if result.winner is None:
+            draws += 1
+        elif result.winner is player1:
+            wins += 1
+        else:
+            losses += 1
+    return name1, name2, wins, draws, losses
+
+
+def _play_chunk(args):
+    """Play a chunk, also returning a snapshot of its latencies if asked."""
+    seed, chunk, latency = args
+    if not latency:
+        return play_chunk(seed, chunk), None
+    with instrument.recording() as recorder:
+        tally = play_chunk(seed, chunk)
+    return tally, recorder.snapshot()
+
+
+def run(
+    n_games,
+    names=None,
+    workers=None,
+    seed=0,
+    chunk_size=1000,
+    on_result=None,
+    latencies=None,
+):
+    """Play n_games for every ordered pairing of players.
+
+    Args:
+        n_games: Number of games per pairing and seat order.
+        names: Difficulties of the players to include. If None, every
+            player in players.difficulties is included.
+        workers: Number of worker processes. If None, one per CPU is used.
+            If 1, games are played in this process.
+        seed: Seed for the whole tournament.
+        chunk_size: Number of games each worker plays at a time.
+        on_result: Optional callback that gets each chunk's tally as it
+            comes back from the workers.
+        latencies: Optional instrument.Recorder. If given, the computer
+            players are timed in every worker and the timings are merged
+            into it.
+
+    Returns:
+        A dict of (name1, name2) pairings to [wins, draws, losses] lists from
+        the point of view of name1, who goes first.
+    """
+    names = list(names or players.difficulties)
+    chunks = make_chunks(names, n_games, chunk_size)
+    tasks = [(seed, chunk, latencies is not None) for chunk in chunks]
+
+    results = {pairing: [0, 0, 0] for pairing in itertools.product(names, repeat=2)}
+
+    def collect(chunk_results):
+        for (name1, name2, *tally), snapshot in chunk_results:
+            for i, n in enumerate(tally):
+                results[name1, name2][i] += n
+            if snapshot is not None:
+                latencies.merge(snapshot)
+            if on_result is not None:
+                on_result(name1, name2, *tally)
+
+    if workers == 1:
+        collect(map(_play_chunk, tasks))
+    else:
+        with multiprocessing.Pool(workers) as pool:
+            collect(pool.imap_unordered(_play_chunk, tasks))
+
+    return results
+
+
+def format_matrix(results, names):
+    """Format tournament results as a matrix of wins/draws/losses.
+
+    Rows are the players going first and columns the players going second.
+    """
+    cells = {
+        pairing: "/".join(str(n) for n in tally) for pairing, tally in results.items()
+    }
+    width = max(len(cell) for cell in list(cells.values()) + names) + 2
+    label = "first \\ second"
+    label_width = max(len(label), *(len(name) for name in names)) + 2
+
+    lines = [label.ljust(label_width) + "".join(name.rjust(width) for name in names)]
+    for name1 in names:
+        row = "".join(cells[name1, name2].rjust(width) for name2 in names)
+        lines.append(name1.ljust(label_width) + row)
+    lines.append("Cells are wins/draws/losses for the player going first.")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "-n", "--games", type=int, default=1000, help="games per pairing"
+    )
+    parser.add_argument(
+        "-w", "--workers", type=int, default=None, help="worker processes"
+    )
+    parser.add_argument("-s", "--seed", type=int, default=0, help="tournament seed")
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument(
+        "-p",
+        "--players",
+        nargs="+",
+        choices=list(players.difficulties),
+        help="difficulties to include (default: all)",
+    )
+    parser.add_argument(
+        "-v", "--verbose", action="store_true", help="print tallies as they arrive"
+    )
+    parser.add_argument(
+        "--latency",
+        action="store_true",
+        help="time the moves of each player and print a latency table",
+    )
+    args = parser.parse_args(argv)
+
+    def print_tally(name1, name2, wins, draws, losses):
+        print(f"{name1} v {name2}: {wins}/{draws}/{losses}", file=sys.stderr)
+
+    names = args.players or list(players.difficulties)
+    latencies = instrument.Recorder() if args.latency else None
+    results = run(
+        args.games,
+        names=names,
+        workers=args.workers,
+        seed=args.seed,
+        chunk_size=args.chunk_size,
+        on_result=print_tally if args.verbose else None,
+        latencies=latencies,
+    )
+    print(format_matrix(results, names))
+    if latencies is not None:
+        print()
+        print(instrument.format_text(latencies.snapshot(), turns=False))
+
+
+if __name__ == "__main__":
+    main()